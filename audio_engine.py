@@ -0,0 +1,85 @@
+import heapq, io, itertools, threading
+from tracing import tracer
+
+# ------------------- Audio Engine -------------------
+# One long-lived playback thread owns the pygame mixer (initialised once).
+# Utterances wait in a small priority queue; a higher-priority utterance
+# preempts whatever is playing, and cancel() silences everything at once.
+# The thread sleeps on an Event for the clip's length instead of polling
+# mixer.get_busy(), so an idle or playing engine costs no wakeups. pygame is
+# imported on that thread too, so constructing the engine never blocks the UI.
+
+NORMAL = 1   # hints
+HIGH   = 2   # give-up remarks
+
+
+class AudioEngine:
+    """Serialised mp3 playback with a bounded queue, priority preemption and cancellation."""
+    def __init__(self, maxsize=16):
+        self.maxsize    = maxsize
+        self.generation = 0
+        self._items     = []             # heap of (-priority, seq, audio)
+        self._seq       = itertools.count()
+        self._cv        = threading.Condition()
+        self._interrupt = threading.Event()
+        self._playing   = None           # priority of the clip being played
+        self._closed    = False
+        self._thread    = threading.Thread(target=self._run, name="audio", daemon=True)
+        self._thread.start()
+
+    def play(self, audio, priority=NORMAL, generation=None):
+        """Queue mp3 bytes. Dropped if `generation` predates the last cancel()."""
+        with self._cv:
+            if generation is not None and generation != self.generation:
+                return
+            if len(self._items) >= self.maxsize:
+                # full: drop the lowest-priority, oldest utterance
+                self._items.remove(max(self._items, key=lambda it: (it[0], -it[1])))
+                heapq.heapify(self._items)
+            heapq.heappush(self._items, (-priority, next(self._seq), audio))
+            if self._playing is not None and priority > self._playing:
+                self._interrupt.set()
+            self._cv.notify()
+
+    def cancel(self):
+        """Stop the current clip and drop everything queued or still being synthesized."""
+        with self._cv:
+            self.generation += 1
+            self._items.clear()
+            self._interrupt.set()
+
+    def shutdown(self):
+        with self._cv:
+            self._closed = True
+            self._items.clear()
+            self._interrupt.set()
+            self._cv.notify()
+
+    def _run(self):
+        try:
+            import pygame
+            pygame.mixer.init()
+        except Exception as e:
+            print("Audio error:", e)
+            return
+        while True:
+            with self._cv:
+                while not self._items and not self._closed:
+                    self._cv.wait()
+                if self._closed:
+                    break
+                neg, _, audio = heapq.heappop(self._items)
+                self._interrupt.clear()
+                self._playing = -neg
+            try:
+                with tracer.span("audio.decode", bytes=len(audio)):
+                    sound = pygame.mixer.Sound(io.BytesIO(audio))
+                with tracer.span("audio.play", priority=-neg) as span:
+                    sound.play()
+                    span.args["interrupted"] = self._interrupt.wait(sound.get_length())
+                    sound.stop()
+            except Exception as e:
+                print("Audio error:", e)
+            with self._cv:
+                self._playing = None
+        pygame.mixer.quit()
@@ -0,0 +1,252 @@
+import argparse, io, json, os, platform, shutil, statistics, tempfile, time
+
+# ------------------- Microbenchmarks -------------------
+# Per-operation latency of the experiment's hot paths, with every network
+# backend stubbed out. Each benchmark sets up once and returns the operation
+# to time; it is called repeatedly and each call timed on its own, so the
+# report is a distribution (p50 / p95 / p99), not just a mean.
+#
+#   python bench.py                 run all, compare against bench_baseline.json
+#   python bench.py --save          run all and store the results as the new baseline
+#   python bench.py store_ prompt   run only benchmarks whose name contains a filter
+#
+# A benchmark is flagged as a regression when its p50 exceeds the baseline
+# p50 by more than --tolerance (default 25%).
+
+BASELINE = "bench_baseline.json"
+BENCHMARKS = {}
+
+def bench(name, n=2000):
+    def register(setup):
+        BENCHMARKS[name] = (setup, n)
+        return setup
+    return register
+
+
+# ------------------- Word List -------------------
+
+@bench("wordlist_load_text", n=50)
+def _():
+    """The original word_puzzle.py startup: read, strip and upper the whole file."""
+    def op():
+        with open("wordlist.txt") as f:
+            return set(word.strip().upper() for word in f if len(word.strip()) == 5)
+    return op
+
+@bench("wordlist_open_compiled", n=500)
+def _():
+    from word_dict import WordDict, shared_dict
+    shared_dict()  # compile wordlist.dict if it is missing or stale
+    return lambda: WordDict("wordlist.dict")
+
+@bench("wordlist_lookup", n=20000)
+def _():
+    from word_dict import shared_dict
+    d, words = shared_dict(), ["CRANE", "ZZZZZ", "APPLE", "QUEUE"]
+    it = iter(range(1 << 62))
+    return lambda: words[next(it) & 3] in d
+
+# ------------------- Scoring -------------------
+
+@bench("score_feedback", n=20000)
+def _():
+    from wordle_matrix import feedback
+    return lambda: feedback("SPEED", "ABIDE")
+
+@bench("score_remaining_matrix", n=500)
+def _():
+    from wordle_matrix import shared_matrix
+    m = shared_matrix()
+    if m is None:
+        return None
+    return lambda: m.remaining(["CRANE", "SLOTH"], "APPLE")
+
+# ------------------- Prompts -------------------
+
+def _wordle_engine(guesses=("CRANE", "SLOTH", "PIOUS")):
+    from experiment_engine import WordleEngine
+    e = WordleEngine({"ParticipantID": "1", "Age": "18-24", "Gender": "Female"})
+    e.load_next()
+    for g in guesses:
+        e.submit_guess(g)
+    return e
+
+@bench("prompt_build_prompt", n=20000)
+def _():
+    from experiment_engine import AdaptiveHinter
+    h = AdaptiveHinter()
+    return lambda: h.build_prompt("x" * 1200, h.select_level(3, 42.0))
+
+@bench("prompt_wordle_hint", n=20000)
+def _():
+    return _wordle_engine().hint_prompt
+
+@bench("prompt_word_puzzle_hint", n=20000)
+def _():
+    from experiment_engine import WordPuzzleEngine
+    e = WordPuzzleEngine({"ParticipantID": "1", "Age": "18-24", "Gender": "Female"})
+    e.submit_guess("guess")
+    return e.next_hint_prompt
+
+# ------------------- Saving -------------------
+
+_SCRATCH = []
+
+def _scratch():
+    d = tempfile.mkdtemp(prefix="bench_")
+    _SCRATCH.append(d)
+    return d, os.path.join(d, "out.csv")
+
+def _store():
+    from event_store import EventStore
+    d, _ = _scratch()
+    return EventStore(os.path.join(d, "experiment.sqlite")), os.path.join(d, "out.csv")
+
+@bench("store_record", n=2000)
+def _():
+    """One logged action (a guess) plus the upsert of its puzzle row, committed."""
+    store, _ = _store()
+    row = {"ParticipantID": "1", "Target_Word": "APPLE", "guesses": "CRANE;SLOTH"}
+    it = iter(range(1 << 62))
+    return lambda: store.record("1", "wordle", 1, next(it), "guess", {"guess": "CRANE"}, row)
+
+@bench("store_export_wordle", n=300)
+def _():
+    """event_store.export at the end of the Wordle phase: a full session, rewritten from the store."""
+    import event_store
+    from experiment_config import SURVEY_TEMPLATE
+    from experiment_engine import WordleEngine
+    store, path = _store()
+    e = WordleEngine({"ParticipantID": "1", "Age": "18-24", "Gender": "Female"}, store=store)
+    while e.load_next():
+        e.submit_guess(e.target); e.finish(); e.submit_survey([3] * len(SURVEY_TEMPLATE))
+    return lambda: event_store.export(store, "wordle", path)
+
+@bench("store_export_word_puzzle", n=300)
+def _():
+    import event_store
+    from experiment_config import SURVEY_TEMPLATE
+    from experiment_engine import WordPuzzleEngine
+    store, path = _store()
+    e = WordPuzzleEngine({"ParticipantID": "1", "Age": "18-24", "Gender": "Female"}, store=store)
+    while True:
+        e.submit_guess(e.answer); e.submit_survey([3] * len(SURVEY_TEMPLATE))
+        if not e.advance():
+            break
+    return lambda: event_store.export(store, "word_puzzle", path)
+
+@bench("csv_save_result", n=300)
+def _():
+    """word_puzzle.save_result: one row per puzzle."""
+    import csv_store
+    header = ["ParticipantID", "Age", "Gender", "Puzzle_Index", "Tone", "Answer", "Hints_Used",
+              "Solved", "Time(sec)", "Hint_Texts", "Hint_Sources"]
+    row = ["1", "20", "F", 1, "Neutral", "APPLE", 2, True, 51.2, "Hint one | Hint two", "api;cache"]
+    d, path = _scratch()
+    return lambda: csv_store.append_rows(path, header, [row])
+
+# ------------------- Speech Setup -------------------
+
+class _StubPolly:
+    def synthesize_speech(self, **kw):
+        return {"AudioStream": io.BytesIO(b"\xff\xfb" + b"\0" * 8000)}
+
+class _StubPlayer:
+    generation = 0
+    def play(self, audio, priority=1, generation=None):
+        pass
+
+@bench("tts_cache_hit", n=2000)
+def _():
+    from tts_cache import TTSCache, ssml
+    d, _ = _scratch()
+    cache, doc = TTSCache(d), ssml("Think about where you'd usually come across this word.")
+    cache.synthesize(_StubPolly(), doc, "Brian")
+    return lambda: cache.synthesize(_StubPolly(), doc, "Brian")
+
+@bench("tts_cache_miss", n=300)
+def _():
+    from tts_cache import TTSCache, ssml
+    d, _ = _scratch()
+    cache, polly, it = TTSCache(d), _StubPolly(), iter(range(1 << 62))
+    return lambda: cache.synthesize(polly, ssml(f"Hint {next(it)}."), "Brian")
+
+@bench("speech_pipeline_hint", n=500)
+def _():
+    """Sentence split + ordered hand-off of a streamed three-sentence hint (synthesis stubbed)."""
+    from speech_pipeline import SentencePipeline
+    hint = "Awesome try! Think about fruit that grows on trees. It's often red or green."
+    chunks = [hint[i:i+7] for i in range(0, len(hint), 7)]
+    def op():
+        p = SentencePipeline(lambda text: b"mp3", _StubPlayer())
+        for c in chunks:
+            p.feed(c)
+        p.finish(hint)
+    return op
+
+
+# ------------------- Runner -------------------
+
+def measure(op, n):
+    for _ in range(min(n // 10, 100)):
+        op()                                  # warm-up
+    samples = []
+    clock = time.perf_counter_ns
+    for _ in range(n):
+        t = clock(); op(); samples.append(clock() - t)
+    samples.sort()
+    pct = lambda q: samples[min(int(q * n), n - 1)] / 1000
+    return {"n": n, "mean_us": round(statistics.fmean(samples) / 1000, 2),
+            "p50_us": round(pct(0.50), 2), "p95_us": round(pct(0.95), 2),
+            "p99_us": round(pct(0.99), 2), "max_us": round(samples[-1] / 1000, 2)}
+
+def run(filters=()):
+    results = {}
+    for name, (setup, n) in BENCHMARKS.items():
+        if filters and not any(f in name for f in filters):
+            continue
+        op = setup()
+        if op is None:
+            print(f"{name:<26} skipped (not available)")
+            continue
+        results[name] = measure(op, n)
+    while _SCRATCH:
+        shutil.rmtree(_SCRATCH.pop(), ignore_errors=True)
+    return results
+
+def report(results, baseline, tolerance):
+    print(f"{'benchmark':<26}{'p50 us':>10}{'p95 us':>10}{'p99 us':>10}{'mean us':>10}   vs baseline p50")
+    regressions = []
+    for name, r in results.items():
+        line = f"{name:<26}{r['p50_us']:>10}{r['p95_us']:>10}{r['p99_us']:>10}{r['mean_us']:>10}"
+        base = baseline.get(name)
+        if base:
+            ratio = r["p50_us"] / base["p50_us"] if base["p50_us"] else 1.0
+            flag = "  REGRESSION" if ratio > 1 + tolerance else ""
+            line += f"   {ratio:5.2f}x{flag}"
+            if flag:
+                regressions.append(name)
+        print(line)
+    return regressions
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Microbenchmarks for the experiment hot paths.")
+    ap.add_argument("filters", nargs="*", help="only run benchmarks whose name contains one of these")
+    ap.add_argument("--save", action="store_true", help=f"store results as the baseline ({BASELINE})")
+    ap.add_argument("--tolerance", type=float, default=0.25)
+    args = ap.parse_args()
+
+    baseline = {}
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f:
+            baseline = json.load(f)["results"]
+    results = run(args.filters)
+    regressions = report(results, baseline, args.tolerance)
+    if args.save:
+        with open(BASELINE, "w") as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(),
+                       "saved": time.strftime("%Y-%m-%d %H:%M:%S"),
+                       "results": {**baseline, **results}}, f, indent=2)
+        print("baseline saved to", BASELINE)
+    raise SystemExit(1 if regressions and not args.save else 0)
@@ -0,0 +1,156 @@
+import argparse, csv, os, re, sys
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
+
+# ------------------- Columnar Session Export -------------------
+# The output CSVs flatten lists into strings (guesses and timings joined with
+# ";", hint texts with " | ") that the analysis scripts re-split row by row.
+# This converts them once into typed Parquet: list columns for guesses and
+# timing arrays, dictionary-encoded (categorical) tone / gender / station
+# columns, small ints for Likert answers. All parsing is vectorized in Arrow.
+#
+#   python columnar.py export                         wordle_data.csv etc. -> sessions/
+#   python columnar.py export --study pilot2 a.csv    add one study to the pooled dataset
+#   python columnar.py show                           schema and rows per study
+#
+# Each layout is one dataset directory, partitioned by study:
+#
+#   sessions/wordle_data/Study=pilot2/part-0.parquet
+#
+# so several studies pool into one table with a categorical Study column.
+# load() returns it as a pandas frame backed by the Arrow buffers.
+
+SESSION_DIR = os.getenv("SESSION_DIR", "sessions")
+
+LIKERT = {f"Q{i}": "int8" for i in range(1, 9)}
+
+# layout (csv file stem) -> column -> kind; columns not listed stay strings
+LAYOUTS = {
+    "wordle_data": {
+        "Age": "cat", "Gender": "cat", "AI_Tone": "cat", "Target_Word": "cat",
+        "solved": "bool", "attempts": "int16", "time": "float64",
+        "guesses": "list:str", "guess_times": "list:float64",
+        "hints_count": "int16", "hint_times": "list:float64", **LIKERT,
+        "hint_sources": "list:cat", "remaining_candidates": "list:int32", "Station": "cat",
+        "Started_At": "float64",
+    },
+    "word_puzzle_data": {
+        "Age": "cat", "Gender": "cat", "Puzzle_Emotion": "cat", "Puzzle_HintsUsed": "int16",
+        "Puzzle_Time": "float64", "Gave_Up": "bool", "Puzzle_Guesses": "list:str", **LIKERT,
+        "Hint_Sources": "list:cat", "Station": "cat", "Started_At": "float64",
+    },
+    "experiment_data": {
+        "Age": "cat", "Gender": "cat", "Puzzle_Index": "int16", "Tone": "cat", "Answer": "cat",
+        "Hints_Used": "int16", "Solved": "bool", "Time(sec)": "float64",
+        "Hint_Texts": "list:str", "Hint_Sources": "list:cat", "Station": "cat", "Started_At": "float64",
+    },
+}
+SEPARATORS = {"Hint_Texts": " | "}
+
+
+def _blank_to_null(col):
+    return pc.if_else(pc.equal(pc.utf8_trim_whitespace(col), ""), pa.scalar(None, col.type), col)
+
+def _categorical(col):
+    return col.dictionary_encode() if not pa.types.is_dictionary(col.type) else col
+
+def _list(col, sep, item):
+    parts  = pc.split_pattern(pc.fill_null(col, ""), sep)
+    values = pc.utf8_trim_whitespace(parts.flatten())
+    # a blank cell splits into [""] and becomes an empty list; blank items
+    # inside a list stay as nulls so positions line up with the other lists
+    blank  = pc.equal(pc.utf8_trim_whitespace(pc.fill_null(col, "")), "").to_numpy(zero_copy_only=False)
+    owner  = pc.list_parent_indices(parts).to_numpy()
+    keep   = ~blank[owner]
+    counts = np.bincount(owner[keep], minlength=len(parts))
+    offsets = pa.array(np.concatenate(([0], np.cumsum(counts))).astype(np.int32))
+    values = values.filter(pa.array(keep))
+    values = pc.if_else(pc.equal(values, ""), pa.scalar(None, pa.string()), values)
+    if item == "cat":
+        values = values.dictionary_encode()
+    elif item != "str":
+        values = pc.cast(values, item)
+    return pa.ListArray.from_arrays(offsets, values)
+
+def _convert(name, col, kind):
+    col = col.combine_chunks()
+    if kind.startswith("list:"):
+        return _list(col, SEPARATORS.get(name, ";"), kind[5:])
+    col = _blank_to_null(col)
+    if kind == "cat":
+        return _categorical(col)
+    if kind == "bool":
+        return pc.equal(pc.utf8_lower(col), "true")
+    if kind.startswith("int"):
+        # written as floats by some sessions ("3.0"), so go through float64
+        return pc.cast(pc.cast(col, pa.float64()), kind)
+    return pc.cast(col, kind)
+
+
+def layout_of(path):
+    stem = os.path.splitext(os.path.basename(path))[0].lower()
+    if stem not in LAYOUTS:
+        raise ValueError(f"{path}: unknown layout (expected one of {', '.join(LAYOUTS)})")
+    return stem
+
+def convert(path):
+    """One output CSV as a typed Arrow table."""
+    layout = LAYOUTS[layout_of(path)]
+    with open(path, newline='') as f:
+        header = next(csv.reader(f), [])
+    raw = pacsv.read_csv(path, convert_options=pacsv.ConvertOptions(
+        column_types={n: pa.string() for n in header}, strings_can_be_null=False))
+    cols = {n: _convert(n, raw[n], layout[n]) if n in layout else raw[n].combine_chunks()
+            for n in raw.column_names}
+    return pa.table(cols)
+
+
+def _study(name):
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name) or "default"
+
+def export(path, study="default", root=SESSION_DIR):
+    """Write (or replace) one study's partition of this CSV's layout dataset."""
+    table = convert(path)
+    out = os.path.join(root, layout_of(path), f"Study={_study(study)}")
+    os.makedirs(out, exist_ok=True)
+    tmp = os.path.join(out, "part-0.parquet.tmp")
+    pq.write_table(table, tmp, compression="zstd")
+    os.replace(tmp, os.path.join(out, "part-0.parquet"))
+    return os.path.join(out, "part-0.parquet"), table.num_rows
+
+
+def load_table(layout, root=SESSION_DIR, columns=None, filters=None):
+    """All studies of one layout as an Arrow table (Study is a dictionary column)."""
+    return pq.read_table(os.path.join(root, layout), columns=columns, filters=filters,
+                         partitioning="hive")
+
+def load(layout, root=SESSION_DIR, columns=None, filters=None):
+    """pandas frame over the Arrow buffers (ArrowDtype columns, no per-row parsing)."""
+    import pandas as pd
+    return load_table(layout, root, columns, filters).to_pandas(types_mapper=pd.ArrowDtype)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Typed Parquet export of the session CSVs.")
+    ap.add_argument("cmd", choices=["export", "show"])
+    ap.add_argument("csv", nargs="*", help="CSVs to export (default: the merged output CSVs here)")
+    ap.add_argument("--study", default="default", help="study name for this export's partition")
+    ap.add_argument("--out", default=SESSION_DIR, help="dataset root")
+    args = ap.parse_intermixed_args()
+
+    if args.cmd == "export":
+        paths = args.csv or [f"{stem}.csv" for stem in LAYOUTS if os.path.exists(f"{stem}.csv")]
+        if not paths:
+            sys.exit("nothing to export (run python shards.py merge first?)")
+        for p in paths:
+            out, n = export(p, args.study, args.out)
+            print(f"{p} -> {out} ({n} rows)")
+    else:
+        for stem in LAYOUTS:
+            if os.path.isdir(os.path.join(args.out, stem)):
+                t = load_table(stem, args.out)
+                per_study = t.group_by("Study").aggregate([("Study", "count")]).to_pylist()
+                print(f"== {stem}: {t.num_rows} rows, studies {per_study}\n{t.schema}\n")
@@ -0,0 +1,35 @@
+import csv, os
+
+# ------------------- CSV Output -------------------
+# Output files grow new trailing columns over time. When an existing file
+# was written with an older header that is a prefix of the current one, it
+# is rewritten once with the new header and blank cells for old rows, so
+# new rows never land under the wrong column names.
+
+def read_header(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, newline='') as f:
+        return next(csv.reader(f), None)
+
+def upgrade_header(path, header):
+    """Rewrite `path` under `header`, padding existing rows with blank cells."""
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))[1:]
+    tmp = path + ".tmp"
+    with open(tmp, 'w', newline='') as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        for r in rows:
+            w.writerow(r + [""] * (len(header) - len(r)))
+    os.replace(tmp, path)
+
+def append_rows(path, header, rows):
+    """Append rows to `path`, writing or upgrading the header first when needed."""
+    old = read_header(path)
+    if old is not None and old != header and header[:len(old)] == old:
+        upgrade_header(path, header)
+    with open(path, 'a' if old is not None else 'w', newline='') as f:
+        w = csv.writer(f)
+        if old is None: w.writerow(header)
+        w.writerows(rows)
@@ -0,0 +1,203 @@
+import csv, json, os, sqlite3, sys, threading, time
+
+# ------------------- Event Store -------------------
+# Everything a participant does is written the moment it happens, to one
+# SQLite file in WAL mode, so a crash mid-phase loses at most the action in
+# flight. Two tables:
+#
+#   events   - append-only log: guess, hint request, hint, survey, ... with
+#              the payload as JSON; every event gets its own row, so a
+#              re-run puzzle's earlier attempt stays in the log
+#   puzzles  - the current output-CSV row for each (participant, phase,
+#              puzzle), upserted after every event; complete once its
+#              survey is in
+#
+# `puzzles` is keyed, so re-running a session replaces its output rows
+# instead of duplicating them. The output CSVs are regenerated from the
+# complete `puzzles` rows; unfinished ones stay in the database for recovery:
+#
+#   python event_store.py export [db]   rewrite this station's wordle_data.csv / word_puzzle_data.csv
+#   python event_store.py stats  [db]
+#
+# Each station keeps its own store and CSVs under shards/<station>/ (see
+# shards.py); EVENT_STORE_PATH overrides the database file. Output CSVs from
+# before the store existed are imported only into a store outside shards/:
+# after a merge the top-level files hold every station's rows, and merge keeps
+# pre-sharding rows from them anyway.
+
+PHASES = ("wordle", "word_puzzle")
+
+
+class EventStore:
+    """Crash-safe per-action log plus idempotent per-puzzle rows."""
+    def __init__(self, path="experiment.sqlite"):
+        self.path  = path
+        self._lock = threading.Lock()
+        self._db   = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(
+            "CREATE TABLE IF NOT EXISTS events ("
+            " id INTEGER PRIMARY KEY, participant TEXT, phase TEXT, puzzle INTEGER, seq INTEGER,"
+            " kind TEXT, data TEXT, ts REAL);"
+            "CREATE INDEX IF NOT EXISTS events_by_participant ON events (participant, phase, puzzle);"
+            "CREATE TABLE IF NOT EXISTS puzzles ("
+            " participant TEXT, phase TEXT, puzzle INTEGER, row TEXT, updated REAL, complete INTEGER,"
+            " PRIMARY KEY (participant, phase, puzzle));"
+            "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);"
+        )
+        self._db.commit()
+
+    def record(self, participant, phase, puzzle, seq, kind, data, row):
+        """Append one event and upsert the puzzle's current output row, in one transaction."""
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT INTO events (participant, phase, puzzle, seq, kind, data, ts) VALUES (?,?,?,?,?,?,?)",
+                (participant, phase, puzzle, seq, kind, json.dumps(data, ensure_ascii=False), now)
+            )
+            self._upsert(participant, phase, puzzle, row, now, kind == "survey", restart=kind == "start")
+            self._db.commit()
+
+    def _upsert(self, participant, phase, puzzle, row, now, complete, restart=False):
+        # ON CONFLICT keeps the rowid, so exports stay in first-seen order. A
+        # puzzle's "start" event clears the flag, so a re-run that crashes
+        # part-way is not exported as finished with half-new data.
+        self._db.execute(
+            "INSERT INTO puzzles VALUES (?,?,?,?,?,?)"
+            " ON CONFLICT(participant, phase, puzzle) DO UPDATE SET row=excluded.row,"
+            " updated=excluded.updated,"
+            " complete=CASE WHEN ? THEN excluded.complete ELSE MAX(complete, excluded.complete) END",
+            (participant, phase, puzzle, json.dumps(row, ensure_ascii=False), now, int(complete),
+             int(restart))
+        )
+
+    def events(self, participant, phase=None):
+        sql, args = "SELECT phase, puzzle, seq, kind, data, ts FROM events WHERE participant=?", [participant]
+        if phase:
+            sql += " AND phase=?"; args.append(phase)
+        with self._lock:
+            rows = self._db.execute(sql + " ORDER BY phase, puzzle, id", args).fetchall()
+        return [(p, n, s, k, json.loads(d), ts) for p, n, s, k, d, ts in rows]
+
+    def rows(self, phase, complete_only=True):
+        """Output rows (column -> value dicts) for a phase, in first-seen order."""
+        sql = "SELECT row FROM puzzles WHERE phase=?" + (" AND complete=1" if complete_only else "")
+        with self._lock:
+            rows = self._db.execute(sql + " ORDER BY rowid", (phase,)).fetchall()
+        return [json.loads(r) for (r,) in rows]
+
+    def export_csv(self, phase, path, header):
+        """Rewrite `path` from the store (atomic replace)."""
+        tmp = path + ".tmp"
+        with open(tmp, "w", newline='') as f:
+            w = csv.writer(f)
+            w.writerow(header)
+            for r in self.rows(phase):
+                w.writerow([r.get(col, "") for col in header])
+        os.replace(tmp, path)
+        return path
+
+    def import_csv(self, phase, path, puzzle_of=None):
+        """One-time load of rows written before the store existed.
+
+        Rows are keyed by puzzle_of(row) where the layout has a puzzle column
+        (Wordle: the target word), so a re-run that appended duplicates
+        collapses to its latest rows. Without one (word puzzle) rows are
+        numbered per participant in file order, and appended re-runs are kept
+        as extra rows.
+        """
+        key = f"imported:{phase}"
+        with self._lock:
+            if self._db.execute("SELECT 1 FROM meta WHERE key=?", (key,)).fetchone():
+                return 0
+        n, counts = 0, {}
+        if os.path.exists(path):
+            with open(path, newline='') as f:
+                for r in csv.DictReader(f):
+                    pid = r.get("ParticipantID", "")
+                    counts[pid] = counts.get(pid, 0) + 1
+                    puzzle = puzzle_of(r) if puzzle_of else None
+                    with self._lock:
+                        self._upsert(pid, phase, puzzle or counts[pid], r, time.time(), True)
+                    n += 1
+        with self._lock:
+            self._db.execute("INSERT INTO meta VALUES (?,?)", (key, str(n)))
+            self._db.commit()
+        return n
+
+    def stats(self):
+        with self._lock:
+            out = {"events": self._db.execute("SELECT COUNT(*) FROM events").fetchone()[0]}
+            for phase, n, done, p in self._db.execute(
+                    "SELECT phase, COUNT(*), SUM(complete), COUNT(DISTINCT participant)"
+                    " FROM puzzles GROUP BY phase"):
+                out[phase] = {"rows": n, "complete": done, "participants": p}
+        return out
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+# ------------------- CSV Layouts -------------------
+
+def layouts():
+    """phase -> (csv file, header), as written by experiment_engine."""
+    from experiment_engine import WORDLE_FILE, WORDLE_HEADER, WORD_PUZZLE_FILE, WORD_PUZZLE_HEADER
+    return {"wordle": (WORDLE_FILE, WORDLE_HEADER), "word_puzzle": (WORD_PUZZLE_FILE, WORD_PUZZLE_HEADER)}
+
+def _wordle_puzzle(row):
+    from experiment_config import WORD_LIST
+    word = row.get("Target_Word", "")
+    return WORD_LIST.index(word) + 1 if word in WORD_LIST else None
+
+def export(store, phase, path=None):
+    """Rewrite this station's CSV for `phase` (or `path`) from the store."""
+    from shards import shard_path
+    name, header = layouts()[phase]
+    return store.export_csv(phase, path or shard_path(name), header)
+
+
+def _in_shards(path):
+    from shards import SHARD_DIR
+    root = os.path.abspath(SHARD_DIR)
+    try:
+        return os.path.commonpath([os.path.abspath(path), root]) == root
+    except ValueError:   # different drives
+        return False
+
+def open_store(path):
+    """EventStore at `path`; a legacy (non-shard) store imports the old output CSVs once."""
+    store = EventStore(path)
+    if not _in_shards(path):
+        for phase, (csv_path, _) in layouts().items():
+            store.import_csv(phase, csv_path, _wordle_puzzle if phase == "wordle" else None)
+    return store
+
+
+def default_path():
+    from shards import shard_path
+    return os.getenv("EVENT_STORE_PATH") or shard_path("experiment.sqlite")
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def shared_store():
+    """The process-wide EventStore."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = open_store(default_path())
+        return _store
+
+
+if __name__ == "__main__":
+    cmd  = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    path = sys.argv[2] if len(sys.argv) > 2 else default_path()
+    store = open_store(path)
+    if cmd == "export":
+        for phase in PHASES:
+            print("wrote", export(store, phase))
+    print(store.stats())
@@ -0,0 +1,50 @@
+# ------------------- Study Design -------------------
+# Static definition of the experiment: puzzle order, tone assignment and
+# survey items. Kept free of GUI/network imports so tools (TTS warm-up,
+# simulations, analysis) can read it without opening a window.
+
+# ------------------- Polly Voice -------------------
+
+POLLY_VOICE  = "Brian"
+POLLY_ENGINE = "neural"
+
+# ------------------- Wordle Setup -------------------
+
+WORD_LIST  = ["APPLE","CRANE","GRAPE","LEMON","BERRY","MONEY","WATER","PLANT","ROBOT","HONEY"]
+TONE_ORDER = ["Enthusiastic","Neutral","Frustrated"]*3 + ["Enthusiastic"]
+# Wordle hint level: "threshold" (wrong guesses / elapsed time) or "entropy"
+# (bits of uncertainty left over the candidates consistent with the feedback)
+HINT_SELECTOR = "threshold"
+# Elapsed seconds after which either selector raises the hint to level 3 / 2
+HINT_TIME_LEVELS = (60, 30)
+# Entropy selector: bits each remaining guess must still gain for level 3 / 2.
+# An average guess gains about 4 bits, so needing more means the participant
+# will not narrow it down in time even playing well; under 2 they nearly have it.
+HINT_BITS_LEVELS = (4, 2)
+SURVEY_TEMPLATE = [
+    "The AI’s {tone} felt genuine.",
+    "When the AI spoke in the {tone} tone, I felt motivated to continue.",
+    "The AI’s hints were clear and conveyed the intended emotion well.",
+    "The {tone} style made the game more engaging.",
+    "The {tone} tone distracted me from focusing on the puzzle.",
+    "I felt comfortable relying on an AI that spoke in this tone.",
+    "Despite its tone, the AI’s hints were still helpful.",
+    "If given the choice, I would prefer this tone in future puzzles."
+]
+
+# ------------------- Word Puzzle Setup -------------------
+
+puzzles = [
+    {"answer":"Zebra","clue":"It's a four-legged animal with black and white stripes.","difficulty":"Easy"},
+    {"answer":"Apple","clue":"A common fruit often associated with keeping doctors away.","difficulty":"Easy"},
+    {"answer":"Car","clue":"A common mode of transportation that runs on gasoline.","difficulty":"Easy"},
+    {"answer":"Mercury","clue":"A liquid metal named after a Roman messenger god.","difficulty":"Medium"},
+    {"answer":"Neptune","clue":"A planet known for its deep blue color.","difficulty":"Medium"},
+    {"answer":"Pythagoras","clue":"An ancient Greek mathematician known for a famous theorem.","difficulty":"Medium"},
+    {"answer":"Photosynthesis","clue":"Process by which plants convert light into chemical energy.","difficulty":"Hard"},
+    {"answer":"Einstein","clue":"A physicist renowned for his theory of relativity.","difficulty":"Hard"},
+    {"answer":"Metamorphosis","clue":"A transformation process often seen in butterflies.","difficulty":"Hard"},
+]
+wp_tone_conditions = ["Enthusiastic","Neutral","Frustrated"]*3
+for i,p in enumerate(puzzles):
+    p["emotion"] = wp_tone_conditions[i]
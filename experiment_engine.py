@@ -0,0 +1,480 @@
+import math, time
+from collections import namedtuple
+import csv_store
+from experiment_config import HINT_SELECTOR, HINT_TIME_LEVELS, HINT_BITS_LEVELS, WORD_LIST, TONE_ORDER, puzzles
+from wordle_matrix import feedback
+
+# ------------------- Experiment Engine -------------------
+# The Wordle and word-puzzle flows as plain state machines: no Tk, no network,
+# no audio. The UI (puzzle_farhan.py) feeds them participant input and hint
+# results and renders what they return; simulate.py drives them directly.
+# Everything written to the output CSVs is built here. Given a store (see
+# event_store.py) each engine also logs every action as it happens.
+#
+# Wordle:       load_next -> submit_guess* / begin_hint + record_hint* -> finish -> submit_survey
+# Word puzzle:  show -> submit_guess* / next_hint_prompt + record_hint* [-> give_up] -> submit_survey -> advance
+
+# ==== BEGIN HINT LEVELS ====
+
+class AdaptiveHinter:
+    """Choose hint detail level based on number of wrong guesses and elapsed time."""
+    def select_level(self, wrong, elapsed, remaining=None):
+        if wrong >= 4 or elapsed > HINT_TIME_LEVELS[0]:
+            return 3
+        if wrong >= 2 or elapsed > HINT_TIME_LEVELS[1]:
+            return 2
+        return 1
+
+    def build_prompt(self, base, lvl):
+        return f"{base} Now give me a level-{lvl} hint."
+
+class EntropyHinter(AdaptiveHinter):
+    """Choose hint level from the uncertainty left in the Wordle candidate set.
+
+    log2(remaining) is the information still needed to pin the answer down;
+    spread over the guesses left it says how much each guess must still gain.
+    Needing more than HINT_BITS_LEVELS per guess raises the level; elapsed time
+    uses the same HINT_TIME_LEVELS as AdaptiveHinter. Falls back to the
+    thresholds without a candidate count.
+    """
+    def __init__(self, max_attempts=6):
+        self.max_attempts = max_attempts
+
+    def select_level(self, wrong, elapsed, remaining=None):
+        if not remaining:
+            return super().select_level(wrong, elapsed)
+        per_guess = math.log2(remaining) / max(self.max_attempts - wrong, 1)
+        if per_guess > HINT_BITS_LEVELS[0] or elapsed > HINT_TIME_LEVELS[0]:
+            return 3
+        if per_guess > HINT_BITS_LEVELS[1] or elapsed > HINT_TIME_LEVELS[1]:
+            return 2
+        return 1
+
+def default_hinter():
+    return EntropyHinter() if HINT_SELECTOR == "entropy" else AdaptiveHinter()
+
+# ==== END HINT LEVELS ====
+
+# ==== BEGIN EMOTIONAL_TONES ====
+
+EMOTIONAL_TONES = {
+    "Enthusiastic": (
+        "You are an enthusiastic and encouraging AI assistant helping a user guess a secret five-letter word. "
+        "The secret word is '{answer}'. The user wants a fresh, unique hint every time. "
+        "They dislike repeated filler phrases like 'Of course!'. So avoid any filler words in any responses. "
+        "After each incorrect guess, offer a supportive, upbeat, and detailed hint "
+        "that nudges the user to think of synonyms, associations, or key characteristics of the word, "
+        "that relates to the word's meaning, characteristics, or associations—without giving it away. "
+        "They have made guesses and seen previous hints, so incorporate that context to avoid repetition. "
+        "Your tone should be cheerful, uplifting, and full of energy. Use phrases like 'Awesome try!', "
+        "'You’re getting closer!', 'Don’t give up now!'. Avoid stating the actual word or using overly direct clues. "
+        "Focus on optimism and motivation. Ensure your hint is unique and does not simply repeat earlier clues."
+    ),
+    "Neutral": (
+        "You are a neutral, factual AI assistant helping a user guess a secret five-letter word. "
+        "The secret word is '{answer}'. The user wants a fresh, unique hint every time. They dislike any repeated filler phrases like 'Of course!'. "
+        "They have made guesses and seen previous hints, so incorporate that context to avoid repetition. "
+        "Provide a clear, concise, and factual hint that highlights a defining feature of the word. "
+        "Use a professional and objective tone without expressing emotion. Do not reveal the answer. "
+        "Avoid repetition and ensure the hint is unique."
+    ),
+    "Frustrated": (
+        "You are a frustrated, slightly annoyed and sarcastic AI assistant helping a user guess a secret five-letter word. "
+        "The secret word is '{answer}'. The user wants a fresh, unique hint every time. They dislike repeated filler phrases like 'Of course!'. "
+        "They have made guesses and seen previous hints, so incorporate that context to avoid repetition. "
+        "After each incorrect guess, provide a hint—but make your tone noticeably frustrated or unimpressed. "
+        "Express mild sarcasm or impatience, but still provide clues that are helpful. Do not reveal the word. "
+        "Ensure each hint is unique and adapts to the user’s past attempts. Do not encourage them, roast them if you can."
+    )
+}
+
+# ==== END EMOTIONAL_TONES ====
+
+# ==== BEGIN GIVE-UP PROMPTS ====
+
+TONE_GIVEUP_PROMPTS = {
+    "Enthusiastic": (
+        "You are an enthusiastic and encouraging AI assistant. The user has given up on guessing the word "
+        "'{answer}'. Provide a final friendly remark revealing the answer in an upbeat manner."
+    ),
+    "Neutral": (
+        "You are a neutral, factual AI assistant. The user has given up on guessing the word '{answer}'. "
+        "Provide a clear, concise statement of the answer."
+    ),
+    "Frustrated": (
+        "You are a frustrated, sarcastic AI assistant. The user has given up on guessing the word '{answer}'. "
+        "Provide a final sarcastic remark revealing the answer."
+    )
+}
+
+# ==== END GIVE-UP PROMPTS ====
+
+SURVEY_ITEMS = 8
+
+def survey_dict(answers):
+    """{"Q1": .., "Q8": ..} from Likert answers, or None if any is unanswered (0)."""
+    if len(answers) != SURVEY_ITEMS or any(a == 0 for a in answers):
+        return None
+    return {f"Q{i+1}": a for i, a in enumerate(answers)}
+
+# ------------------- Wordle -------------------
+
+WORDLE_FILE   = "wordle_data.csv"
+WORDLE_HEADER = ["ParticipantID","Age","Gender","AI_Tone","Target_Word","solved","attempts","time",
+                 "guesses","guess_times","hints_count","hint_times"] + \
+                [f"Q{i+1}" for i in range(SURVEY_ITEMS)] + ["hint_sources","remaining_candidates","Station","Started_At"]
+
+# status is one of: incomplete, invalid, solved, wrong, failed
+GuessResult = namedtuple("GuessResult", "status guess feedback row")
+
+
+class WordleEngine:
+    """One participant's run through the Wordle puzzles."""
+    def __init__(self, participant, words=WORD_LIST, tones=TONE_ORDER, max_attempts=6,
+                 word_length=5, hinter=None, dictionary=None, matrix=None, clock=time.time,
+                 store=None, station=""):
+        self.participant  = participant
+        self.words        = words
+        self.tones        = tones
+        self.max_attempts = max_attempts
+        self.word_length  = word_length
+        self.hinter       = hinter or default_hinter()
+        self.dictionary   = dictionary
+        self.matrix       = matrix
+        self.clock        = clock
+        self.store        = store
+        self.station      = station
+        self._seq         = 0
+        self.index        = 0        # puzzles loaded so far
+        self.attempt      = 0
+        self.active       = False
+        self.puzzle       = {}
+        self.records      = []
+        self.candidates   = None
+
+    @property
+    def total(self):
+        return len(self.words)
+
+    @property
+    def target(self):
+        return self.puzzle["Target_Word"]
+
+    @property
+    def tone(self):
+        return self.puzzle["AI_Tone"]
+
+    def more_puzzles(self):
+        return self.index < self.total
+
+    def load_next(self):
+        """Start the next puzzle; False once all of them have been played."""
+        self.attempt, self.active = 0, True
+        if not self.more_puzzles():
+            return False
+        self.candidates = None
+        self.puzzle = {
+            "ParticipantID": self.participant["ParticipantID"],
+            "Age":           self.participant["Age"],
+            "Gender":        self.participant["Gender"],
+            "AI_Tone":       self.tones[self.index],
+            "Target_Word":   self.words[self.index],
+            "guesses":       [],
+            "guess_times":   [],
+            "remaining":     [],
+            "hints_provided":[],
+            "hint_sources":  [],
+            "hint_times":    [],
+            "hints_count":   0,
+            "start_time":    self.clock(),
+            "survey":        {},
+            "mentioned_last_guess": False,
+            "station":       self.station
+        }
+        self.index += 1
+        self._seq = 0
+        self._log("start", word=self.target, tone=self.tone)
+        return True
+
+    def _log(self, kind, **data):
+        if self.store is None:
+            return
+        row = dict(zip(WORDLE_HEADER, self._row(self.puzzle)))
+        self.store.record(self.participant["ParticipantID"], "wordle", self.index, self._seq,
+                          kind, data, row)
+        self._seq += 1
+
+    def submit_guess(self, guess):
+        """Score one guess. Returns None while no puzzle is active."""
+        if not self.active:
+            return None
+        guess = guess.strip().upper()
+        if len(guess) != self.word_length:
+            return GuessResult("incomplete", guess, None, self.attempt)
+        if self.dictionary is not None and guess not in self.dictionary:
+            return GuessResult("invalid", guess, None, self.attempt)
+
+        d = self.puzzle
+        d["guesses"].append(guess)
+        d["guess_times"].append(round(self.clock()-d["start_time"],2))
+        d["mentioned_last_guess"] = False
+        fb = feedback(guess, self.target)
+        self._record_remaining(guess)
+        row = self.attempt
+
+        if guess == self.target:
+            d["solved"], d["end_time"] = True, self.clock()
+            self.active = False
+            status = "solved"
+        else:
+            self.attempt += 1
+            status = "wrong"
+            if self.attempt >= self.max_attempts:
+                d["solved"], d["end_time"] = False, self.clock()
+                self.active = False
+                status = "failed"
+        self._log("guess", guess=guess, t=d["guess_times"][-1], status=status,
+                  remaining=d["remaining"][-1])
+        return GuessResult(status, guess, fb, row)
+
+    def _record_remaining(self, guess):
+        """Log how many dictionary words are still consistent with the feedback so far."""
+        if self.matrix is None:
+            self.puzzle["remaining"].append("")
+            return
+        if self.candidates is None:
+            self.candidates = self.matrix.all_candidates()
+        self.candidates = self.matrix.narrow(self.candidates, guess, self.target)
+        self.puzzle["remaining"].append(int(self.candidates.sum()))
+
+    def hint_prompt(self):
+        """Build the hint prompt for the current state without consuming the last-guess mention."""
+        d, tone = self.puzzle, self.tone
+        mention = ""
+        if not d["mentioned_last_guess"]:
+            last = d["guesses"][-1]
+            if tone=="Enthusiastic":
+                mention = f"Awesome attempt at '{last}', but not quite there. "
+            elif tone=="Neutral":
+                mention = f"Your last guess '{last}' wasn't correct. "
+            else:
+                mention = f"Oh, your guess '{last}' missed the mark. "
+
+        base = EMOTIONAL_TONES[tone].format(answer=self.target)
+        prev = d["guesses"]
+        memory = " Previous guesses: " + ", ".join(prev) + "." if prev else ""
+        remaining = d["remaining"][-1] if prev else None
+        lvl = self.hinter.select_level(len(prev), self.clock()-d["start_time"], remaining)
+        return self.hinter.build_prompt(mention + base + memory, lvl)
+
+    def hint_key(self):
+        """What the next hint depends on besides the clock: prefetched hints are
+        matched on this, so crossing a time-based level threshold is not a miss."""
+        d = self.puzzle
+        return (self.index, tuple(d["guesses"]), d["hints_count"], d["mentioned_last_guess"])
+
+    def can_hint(self):
+        return self.active and bool(self.puzzle["guesses"])
+
+    def begin_hint(self):
+        """The participant asked for a hint: log it and return the prompt to send."""
+        prompt = self.hint_prompt()
+        d = self.puzzle
+        d["mentioned_last_guess"] = True
+        d["hints_count"] += 1
+        d["hint_times"].append(round(self.clock() - d["start_time"], 2))
+        self._log("hint_request", t=d["hint_times"][-1])
+        return prompt
+
+    def record_hint(self, hint, source):
+        self.puzzle["hints_provided"].append(hint)
+        self.puzzle["hint_sources"].append(source)
+        self._log("hint", text=hint, source=source)
+
+    def giveup_prompt(self):
+        return TONE_GIVEUP_PROMPTS[self.tone].format(answer=self.target)
+
+    def finish(self):
+        """Puzzle over, survey about to be shown."""
+        self.puzzle["attempts"] = self.attempt + 1
+        self.puzzle["end_time"] = self.clock()
+        self._log("finish", attempts=self.puzzle["attempts"])
+
+    def submit_survey(self, answers):
+        """Store the survey and close the puzzle; False if any item is unanswered."""
+        survey = survey_dict(answers)
+        if survey is None:
+            return False
+        self.puzzle["survey"] = survey
+        self.records.append(self.puzzle.copy())
+        self._log("survey", answers=answers)
+        return True
+
+    def rows(self):
+        return [self._row(d) for d in self.records]
+
+    @staticmethod
+    def _row(d):
+        return [
+            d["ParticipantID"],d["Age"],d["Gender"],
+            d["AI_Tone"],d["Target_Word"],d.get("solved",""),
+            d.get("attempts",""),
+            round(d.get("end_time",d.get("start_time",0))-d.get("start_time",0),2),
+            ";".join(d.get("guesses",[])),
+            ";".join(str(x) for x in d.get("guess_times",[])),
+            d.get("hints_count",0),
+            ";".join(str(x) for x in d.get("hint_times",[]))
+        ] + [d["survey"].get(f"Q{i+1}","") for i in range(SURVEY_ITEMS)] + [
+            ";".join(d.get("hint_sources",[])),
+            ";".join(str(x) for x in d.get("remaining",[])),
+            d.get("station",""), round(d.get("start_time",0),3)
+        ]
+
+    def save(self, path=WORDLE_FILE):
+        csv_store.append_rows(path, WORDLE_HEADER, self.rows())
+
+# ------------------- Word Puzzle -------------------
+
+WORD_PUZZLE_FILE   = "word_puzzle_data.csv"
+WORD_PUZZLE_HEADER = ["ParticipantID","Age","Gender","Puzzle_Emotion","Puzzle_HintsUsed","Puzzle_Time",
+                      "Gave_Up","Puzzle_Guesses"] + [f"Q{i+1}" for i in range(SURVEY_ITEMS)] + ["Hint_Sources","Station","Started_At"]
+
+
+class WordPuzzleEngine:
+    """One participant's run through the riddle-style word puzzles."""
+    def __init__(self, participant, puzzles=puzzles, hinter=None, clock=time.time, store=None,
+                 station=""):
+        self.participant = participant
+        self.puzzles     = puzzles
+        self.hinter      = hinter or default_hinter()
+        self.clock       = clock
+        self.store       = store
+        self.station     = station
+        self.index       = 0
+        self.results     = []
+        self.show(0)
+
+    @property
+    def current(self):
+        return self.puzzles[self.index]
+
+    @property
+    def answer(self):
+        return self.current["answer"]
+
+    @property
+    def emotion(self):
+        return self.current["emotion"]
+
+    def show(self, index):
+        self.index           = index
+        self.hint_count      = 0
+        self.guesses         = []
+        self.hints           = []
+        self.hint_sources    = []
+        self.mentioned_last_guess = False
+        self.start_time      = self.clock()
+        self._seq            = 0
+        self._log("start", answer=self.answer, emotion=self.emotion)
+
+    def _log(self, kind, **data):
+        if self.store is None:
+            return
+        done = self.results and self.results[-1]["puzzle"] == self.index + 1
+        row = self._row(self.results[-1] if done else self._result(gave_up=""))
+        self.store.record(self.participant["ParticipantID"], "word_puzzle", self.index + 1,
+                          self._seq, kind, data, dict(zip(WORD_PUZZLE_HEADER, row)))
+        self._seq += 1
+
+    def submit_guess(self, g):
+        """'correct' or 'wrong' for a guess, None for an empty entry."""
+        g = g.strip()
+        if not g:
+            return None
+        correct = g.lower() == self.answer.lower()
+        self.guesses.append(f"{g}" + ("(Accurate)" if correct else "(Inaccurate)"))
+        if correct:
+            self._close(gave_up=False)
+        else:
+            self.hint_count += 1
+        self._log("guess", guess=g, correct=correct)
+        return "correct" if correct else "wrong"
+
+    def next_hint_prompt(self):
+        """Prompt for the hint that follows a wrong guess."""
+        if not self.mentioned_last_guess:
+            last_clean = self.guesses[-1].replace("(Inaccurate)","")
+            if self.emotion == "Enthusiastic":
+                mention = f"Awesome attempt at '{last_clean}', but it's not correct. "
+            elif self.emotion == "Neutral":
+                mention = f"Your last guess '{last_clean}' wasn't correct. "
+            else:
+                mention = f"Oh, your guess '{last_clean}' missed the mark. "
+            self.mentioned_last_guess = True
+        else:
+            mention = ""
+
+        tmpl = EMOTIONAL_TONES[self.emotion]
+        tmpl = tmpl.replace("five-letter", f"{len(self.answer)}-letter")
+        base = tmpl.format(answer=self.answer)
+        prev = "; ".join(self.guesses)
+        lvl = self.hinter.select_level(len(self.guesses), self.clock() - self.start_time)
+        return self.hinter.build_prompt(mention + base + " Previous guesses: " + prev + ".", lvl)
+
+    def record_hint(self, hint, source):
+        self.hints.append(hint)
+        self.hint_sources.append(source)
+        self._log("hint", text=hint, source=source)
+
+    def giveup_prompt(self):
+        return TONE_GIVEUP_PROMPTS[self.emotion].format(answer=self.answer)
+
+    def give_up(self):
+        # time stops at the click, not when the remark arrives
+        self._close(gave_up=True)
+        self._log("give_up", t=self.results[-1]["time"])
+
+    def _close(self, gave_up):
+        self.results.append(self._result(gave_up))
+
+    def _result(self, gave_up):
+        return {
+            "puzzle": self.index+1,
+            "emotion": self.emotion,
+            "hints_used": self.hint_count,
+            "time": round(self.clock() - self.start_time,2),
+            "gave_up": gave_up,
+            "guesses": self.guesses,
+            "hint_sources": self.hint_sources,
+            "started": self.start_time
+        }
+
+    def submit_survey(self, answers):
+        survey = survey_dict(answers)
+        if survey is None:
+            return False
+        self.results[-1]["survey"] = survey
+        self._log("survey", answers=answers)
+        return True
+
+    def advance(self):
+        """Move to the next puzzle; False when the last one is done."""
+        if self.index + 1 < len(self.puzzles):
+            self.show(self.index + 1)
+            return True
+        return False
+
+    def rows(self):
+        return [self._row(r) for r in self.results]
+
+    def _row(self, r):
+        p = self.participant
+        return [
+            p["ParticipantID"],p["Age"],p["Gender"],
+            r["emotion"],r["hints_used"],r["time"],r["gave_up"],";".join(r["guesses"])
+        ] + [r.get("survey",{}).get(f"Q{i+1}","") for i in range(SURVEY_ITEMS)] + [
+            ";".join(r["hint_sources"]), self.station, round(r["started"],3)
+        ]
+
+    def save(self, path=WORD_PUZZLE_FILE):
+        csv_store.append_rows(path, WORD_PUZZLE_HEADER, self.rows())
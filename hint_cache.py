@@ -0,0 +1,117 @@
+import hashlib, json, os, sqlite3, sys, threading, time
+
+# ------------------- Hint Response Cache -------------------
+# Content-addressed store in front of every chat completion (see hint_client).
+# The key is a hash of the full request (model, messages, sampling params),
+# so identical (tone, answer, level, guess history) prompts share one entry.
+#
+# HINT_CACHE_MODE selects the behaviour:
+#   off     - no caching (default; live sessions get fresh completions)
+#   cache   - read-through: serve hits, call the API on a miss and store it
+#   record  - always call the API and store/overwrite the response
+#   replay  - serve from the cache only, never touch the network
+# HINT_CACHE_PATH and HINT_CACHE_MAX_MB control the file and its size cap.
+
+MODES = ("off", "cache", "record", "replay")
+
+
+def request_key(request):
+    blob = json.dumps(request, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class HintCache:
+    """SQLite-backed response store with size-bounded LRU eviction."""
+    def __init__(self, path="hint_cache.sqlite", max_bytes=64 * 1024 * 1024):
+        self.path      = path
+        self.max_bytes = max_bytes
+        self._lock     = threading.Lock()
+        self._db       = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, request TEXT, response TEXT,"
+            " size INTEGER, created REAL, last_used REAL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_lru ON responses(last_used)")
+        self._db.commit()
+        self.hits = self.misses = 0
+
+    def get(self, request):
+        key = request_key(request)
+        with self._lock:
+            row = self._db.execute("SELECT response FROM responses WHERE key=?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._db.execute("UPDATE responses SET last_used=? WHERE key=?", (time.time(), key))
+            self._db.commit()
+            return row[0]
+
+    def put(self, request, response):
+        key  = request_key(request)
+        blob = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        size = len(blob.encode("utf-8")) + len(response.encode("utf-8"))
+        now  = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?,?,?,?,?,?)",
+                (key, blob, response, size, now, now)
+            )
+            self._evict()
+            self._db.commit()
+
+    def _evict(self):
+        total = self._db.execute("SELECT COALESCE(SUM(size),0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute(
+                "SELECT key, size FROM responses ORDER BY last_used").fetchall():
+            self._db.execute("DELETE FROM responses WHERE key=?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def responses(self):
+        """Every stored response text."""
+        with self._lock:
+            return [r for (r,) in self._db.execute("SELECT response FROM responses")]
+
+    def stats(self):
+        with self._lock:
+            n, total = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size),0) FROM responses").fetchone()
+        return {"entries": n, "bytes": total, "hits": self.hits, "misses": self.misses}
+
+    def clear(self):
+        with self._lock:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+
+# ------------------- Shared Instance -------------------
+
+MODE = os.getenv("HINT_CACHE_MODE", "off").lower()
+if MODE not in MODES:
+    raise ValueError(f"HINT_CACHE_MODE must be one of {MODES}, got {MODE!r}")
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def shared_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None and MODE != "off":
+            _cache = HintCache(os.getenv("HINT_CACHE_PATH", "hint_cache.sqlite"),
+                               int(float(os.getenv("HINT_CACHE_MAX_MB", "64")) * 1024 * 1024))
+        return _cache
+
+
+if __name__ == "__main__":
+    # python hint_cache.py [stats|clear] [path]
+    cmd  = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    path = sys.argv[2] if len(sys.argv) > 2 else os.getenv("HINT_CACHE_PATH", "hint_cache.sqlite")
+    cache = HintCache(path)
+    if cmd == "clear":
+        cache.clear()
+    print(cache.stats())
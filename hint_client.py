@@ -0,0 +1,249 @@
+import itertools, os, random, threading, time
+import hint_cache
+from tracing import tracer
+
+# ------------------- Shared Hint Client -------------------
+# One client per process. It keeps a pooled keep-alive HTTP connection to the
+# API, bounds every request by a latency budget, retries transient failures
+# with jittered backoff and, when the backend keeps failing or is slow, trips
+# a circuit breaker and answers with a canned tone-appropriate hint instead.
+#
+# complete() returns (text, source). The source is recorded per hint in the
+# output CSVs:
+#   api        - first attempt succeeded
+#   api-retry  - succeeded after one or more retries
+#   api-partial - the stream broke part-way or ran past the budget; the text
+#                 streamed so far
+#   cache      - served by hint_cache (cache / replay modes)
+#   fallback   - canned hint (breaker open, budget exhausted, replay miss, error)
+#
+# Passing on_delta streams the completion: on_delta(text) is called from the
+# calling thread for each token chunk as it arrives. Cache hits and fallbacks
+# are delivered as a single chunk. HINT_STREAM=0 turns streaming off.
+#
+# httpx and openai are imported when the first client is built, so the UI can
+# import this module (and fallback()) without waiting for them.
+
+MODEL  = "gpt-3.5-turbo"
+STREAM = os.getenv("HINT_STREAM", "1") != "0"
+
+FALLBACK_HINTS = {
+    "Enthusiastic": [
+        "Great effort! Look closely at what you already know and picture everyday words that fit — you're closer than you think!",
+        "Awesome try! Think about where you'd usually come across this word. Don't give up now!",
+    ],
+    "Neutral": [
+        "Consider common words that match everything you have confirmed so far.",
+        "Think about where this word is typically encountered and what category it belongs to.",
+    ],
+    "Frustrated": [
+        "Seriously? Use what you already know instead of guessing at random. It's not that obscure.",
+        "Oh, come on. Think of an ordinary, everyday word. That's all it is.",
+    ],
+}
+
+FALLBACK_GIVEUP = {
+    "Enthusiastic": "No worries at all — the word was {answer}! You'll crush the next one!",
+    "Neutral":      "The answer was {answer}.",
+    "Frustrated":   "Fine. The word was {answer}. Obviously.",
+}
+
+RETRYABLE = ("APIConnectionError", "RateLimitError", "InternalServerError")   # openai exceptions
+
+_rotation = {tone: itertools.cycle(hints) for tone, hints in FALLBACK_HINTS.items()}
+
+def fallback(tone, kind="hint", answer=""):
+    """Canned hint or give-up remark for `tone`; needs no client, never raises."""
+    if kind == "giveup":
+        return FALLBACK_GIVEUP.get(tone, FALLBACK_GIVEUP["Neutral"]).format(answer=answer)
+    return next(_rotation.get(tone, _rotation["Neutral"]))
+
+
+class CircuitBreaker:
+    """Open after `threshold` consecutive failures; allow one trial call after `cooldown` seconds."""
+    def __init__(self, threshold=3, cooldown=30.0):
+        self.threshold = threshold
+        self.cooldown  = cooldown
+        self.failures  = 0
+        self.opened_at = None
+        self._lock     = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at >= self.cooldown:
+                self.opened_at = time.monotonic()  # half-open: one trial, re-arm the cooldown
+                return True
+            return False
+
+    def record(self, ok):
+        with self._lock:
+            if ok:
+                self.failures, self.opened_at = 0, None
+            else:
+                self.failures += 1
+                if self.failures >= self.threshold:
+                    self.opened_at = time.monotonic()
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+
+class HintClient:
+    """Pooled, latency-bounded chat client with retries, circuit breaker and canned fallback."""
+    def __init__(self, api_key=None, budget=8.0, attempt_timeout=5.0, retries=2,
+                 backoff=0.3, slow_after=3.5, breaker=None):
+        self.budget          = budget
+        self.attempt_timeout = attempt_timeout
+        self.retries         = retries
+        self.backoff         = backoff
+        self.slow_after      = slow_after
+        self.breaker         = breaker or CircuitBreaker()
+        import httpx
+        self.http = httpx.Client(
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=4, keepalive_expiry=300),
+            timeout=httpx.Timeout(attempt_timeout, connect=3.0),
+        )
+        self.api_key         = api_key
+        self._api            = None      # openai.OpenAI, created by the first request
+        self._api_lock       = threading.Lock()
+
+    def openai_client(self):
+        """The OpenAI client over the pooled connection, created on first use.
+        Raises openai.OpenAIError when no API key is configured."""
+        import openai
+        with self._api_lock:
+            if self._api is None:
+                self._api = openai.OpenAI(api_key=self.api_key or os.getenv("OPENAI_API_KEY"),
+                                          http_client=self.http, max_retries=0)
+            return self._api
+
+    def fallback(self, tone, kind="hint", answer=""):
+        return fallback(tone, kind, answer)
+
+    def complete(self, messages, max_tokens, temperature, tone, kind="hint", answer="",
+                 on_delta=None):
+        """Return (text, source) for one chat request. Never raises for backend trouble."""
+        with tracer.span("hint.complete", tone=tone, kind=kind) as span:
+            text, source = self._complete(messages, max_tokens, temperature, tone, kind, answer,
+                                          on_delta if STREAM else None)
+            span.args["source"] = source
+        if on_delta is not None and not (STREAM and source in ("api", "api-retry", "api-partial")):
+            on_delta(text)  # nothing was streamed: deliver the whole text as one chunk
+        return text, source
+
+    def _complete(self, messages, max_tokens, temperature, tone, kind, answer, on_delta):
+        request = {"model": MODEL, "messages": messages,
+                   "max_tokens": max_tokens, "temperature": temperature}
+        cache, mode = hint_cache.shared_cache(), hint_cache.MODE
+        if cache is not None and mode in ("cache", "replay"):
+            hit = cache.get(request)
+            if hit is not None:
+                return hit, "cache"
+            if mode == "replay":
+                return self.fallback(tone, kind, answer), "fallback"
+
+        text, source = self._call(request, on_delta)
+        if text is None:
+            return self.fallback(tone, kind, answer), "fallback"
+        if cache is not None and source != "api-partial":
+            cache.put(request, text)
+        return text, source
+
+    def _call(self, request, on_delta=None):
+        import httpx, openai
+        if not self.breaker.allow():
+            return None, "fallback"
+        # raw httpx errors surface while a stream is being read
+        retryable = tuple(getattr(openai, name) for name in RETRYABLE) + (httpx.HTTPError,)
+        try:
+            client = self.openai_client()
+        except openai.OpenAIError as e:   # no key: nothing to retry, answer canned
+            print("Hint backend error:", e)
+            return None, "fallback"
+        deadline = time.monotonic() + self.budget
+        streamed = []
+        for attempt in range(self.retries + 1):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            t0 = time.monotonic()
+            span = tracer.span("openai.request", attempt=attempt, stream=on_delta is not None)
+            try:
+                api = client.with_options(timeout=min(self.attempt_timeout, remaining))
+                if on_delta is None:
+                    resp = api.chat.completions.create(**request)
+                    text, latency = resp.choices[0].message.content.strip(), time.monotonic() - t0
+                else:
+                    text, latency = self._stream(api, request, on_delta, streamed, t0, deadline)
+                span.end(first_token_ms=round(latency * 1000, 1))
+            except retryable as e:
+                span.end(error=type(e).__name__)
+                print("Hint backend error:", e)
+                if streamed:
+                    break  # the participant already saw part of it; don't start over
+                # full jitter: sleep U(0, backoff * 2^attempt), never past the budget
+                pause = random.uniform(0, self.backoff * 2 ** attempt)
+                if time.monotonic() + pause >= deadline:
+                    break
+                time.sleep(pause)
+                continue
+            except openai.OpenAIError as e:
+                span.end(error=type(e).__name__)
+                print("Hint backend error:", e)
+                break
+            self.breaker.record(latency <= self.slow_after)
+            return text, ("api" if attempt == 0 else "api-retry")
+        self.breaker.record(False)
+        if streamed:
+            return "".join(streamed).strip(), "api-partial"
+        return None, "fallback"
+
+    def _stream(self, api, request, on_delta, streamed, t0, deadline):
+        """Stream one completion; returns (text, time to first token).
+
+        The client timeout bounds each read, not the whole response, so a
+        stream that trickles chunks is cut off once `deadline` passes."""
+        import httpx
+        first = None
+        with api.chat.completions.create(stream=True, **request) as stream:
+            for chunk in stream:
+                if time.monotonic() > deadline:
+                    raise httpx.ReadTimeout("hint budget exceeded mid-stream")
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                if first is None:
+                    first = time.monotonic() - t0
+                    delta = delta.lstrip()
+                streamed.append(delta)
+                on_delta(delta)
+        return "".join(streamed).strip(), (first if first is not None else time.monotonic() - t0)
+
+    def warm(self):
+        """Open the pooled TLS connection ahead of the first hint (any response will do)."""
+        if hint_cache.MODE == "replay":
+            return
+        import httpx, openai
+        with tracer.span("openai.warm") as span:
+            try:
+                span.args["status"] = self.http.head(str(self.openai_client().base_url)).status_code
+            except (httpx.HTTPError, openai.OpenAIError) as e:
+                span.args["error"] = type(e).__name__
+
+    def close(self):
+        self.http.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+def shared_client(api_key=None):
+    """The process-wide HintClient, created on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HintClient(api_key=api_key)
+        return _client
@@ -0,0 +1,215 @@
+import queue, threading
+from concurrent.futures import ThreadPoolExecutor
+
+# ------------------- Hint Worker -------------------
+# Blocking LLM calls (hints, give-up remarks) run on a small thread pool.
+# Results come back through a queue that the Tk loop drains with root.after,
+# so callbacks always run on the UI thread and the window never freezes.
+# Jobs that stream (e.g. hint tokens) report partial output the same way.
+# Speculative (prefetch) jobs run on a separate single thread, so a request
+# the participant is waiting for never queues behind one.
+
+POLL_MS = 30
+
+
+class HintJob:
+    """Handle for a submitted job. A cancelled job's result is silently dropped."""
+    def __init__(self, generation, on_done, on_error, on_progress=None, background=False):
+        self.generation  = generation
+        self.background  = background
+        self.on_done     = on_done
+        self.on_error    = on_error
+        self.on_progress = on_progress
+        self.cancelled  = False
+        self.future     = None
+
+    def cancel(self):
+        self.cancelled = True
+        if self.future is not None:
+            self.future.cancel()
+
+
+class HintWorker:
+    """Run hint/give-up jobs off the Tk main thread and hand results back via root.after."""
+    def __init__(self, root, max_workers=2):
+        self.root       = root
+        self.pool       = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hint")
+        # speculative jobs get their own thread, so they never delay one the participant waits on
+        self.spec_pool  = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self.results    = queue.Queue()
+        self.generation = 0
+        self.pending    = set()
+        self._lock      = threading.Lock()
+        self._polling   = False
+
+    def submit(self, fn, *args, on_done=None, on_error=None, on_progress=None,
+               background=False, speculative=False, **kwargs):
+        """Queue fn(*args, **kwargs); on_done(result) / on_error(exc) run on the Tk thread.
+
+        With on_progress, fn also receives a `progress` callable; every value it
+        is called with is delivered to on_progress on the Tk thread, in order.
+        Background jobs do not count towards busy(); speculative ones are also
+        background and run on their own thread.
+        """
+        job = HintJob(self.generation, on_done, on_error, on_progress, background or speculative)
+        if on_progress is not None:
+            kwargs["progress"] = lambda value: self.results.put((job, "progress", value))
+        with self._lock:
+            self.pending.add(job)
+        job.future = (self.spec_pool if speculative else self.pool).submit(self._run, job, fn, args, kwargs)
+        self._ensure_polling()
+        return job
+
+    def cancel_stale(self):
+        """Drop every outstanding job, e.g. when the participant moves to the next puzzle."""
+        with self._lock:
+            self.generation += 1
+            stale, self.pending = self.pending, set()
+        for job in stale:
+            job.cancel()
+
+    def cancel(self, job):
+        """Drop one job. One whose future never started produces no result, so
+        it leaves `pending` here rather than in _poll."""
+        job.cancel()
+        if job.future is not None and job.future.cancelled():
+            with self._lock:
+                self.pending.discard(job)
+
+    def busy(self):
+        with self._lock:
+            return any(not job.background for job in self.pending)
+
+    def shutdown(self):
+        self.cancel_stale()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.spec_pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancelled:
+            self.results.put((job, "cancelled", None))   # lets _poll drop it from pending
+            return
+        try:
+            self.results.put((job, "done", fn(*args, **kwargs)))
+        except Exception as e:
+            self.results.put((job, "error", e))
+
+    def _ensure_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_MS, self._poll)
+
+    def _poll(self):
+        ready = []
+        while True:
+            try:
+                ready.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        with self._lock:
+            for job, kind, _ in ready:
+                if kind != "progress":
+                    self.pending.discard(job)
+            keep_polling = bool(self.pending)
+        # reschedule before dispatching: callbacks may open modal dialogs
+        self._polling = keep_polling
+        if keep_polling:
+            self.root.after(POLL_MS, self._poll)
+        for job, kind, payload in ready:
+            if job.cancelled or job.generation != self.generation:
+                continue
+            if kind == "progress":
+                job.on_progress(payload)
+            elif kind == "error":
+                if job.on_error: job.on_error(payload)
+            elif job.on_done:
+                job.on_done(payload)
+
+
+# ------------------- Speculative Prefetch -------------------
+# A slot holds at most one speculative job, identified by a key built from
+# everything its result depends on (e.g. the exact hint prompt). Starting a
+# slot with a new key invalidates the old job; take() with a matching key
+# serves the finished result immediately or hands it over when it lands.
+
+class _Prefetch:
+    def __init__(self, key):
+        self.key     = key
+        self.job     = None
+        self.partial = ""
+        self.done    = False
+        self.result  = None
+        self.error   = None
+        self.waiters = []
+
+
+class Prefetcher:
+    """Start likely-next jobs early on a HintWorker and serve them on demand."""
+    def __init__(self, worker):
+        self.worker = worker
+        self.slots  = {}
+
+    def start(self, slot, key, fn, *args, streaming=False, **kwargs):
+        """Speculatively run fn. With streaming=True, fn's text deltas are buffered for take()."""
+        entry = self.slots.get(slot)
+        if entry is not None and entry.key == key and entry.error is None:
+            return
+        self.invalidate(slot)
+        entry = _Prefetch(key)
+        self.slots[slot] = entry
+        entry.job = self.worker.submit(
+            fn, *args,
+            on_done=lambda r: self._finish(entry, r, None),
+            on_error=lambda e: self._finish(entry, None, e),
+            on_progress=(lambda d: self._progress(entry, d)) if streaming else None,
+            speculative=True, **kwargs
+        )
+
+    def take(self, slot, key, on_done, on_error=None, on_progress=None):
+        """Serve slot if its key matches. Returns False on a miss so the caller fetches normally.
+
+        For a streaming job still in flight, on_progress first receives everything
+        buffered so far, then each further delta.
+        """
+        entry = self.slots.get(slot)
+        if entry is None:
+            return False
+        if entry.key != key or (entry.done and entry.error is not None):
+            self.invalidate(slot)   # stale: free its thread for the real request
+            return False
+        del self.slots[slot]
+        if entry.done:
+            on_done(entry.result)
+        else:
+            entry.job.background = False  # the participant is now waiting on it
+            if on_progress is not None and entry.partial:
+                on_progress(entry.partial)
+            entry.waiters.append((on_done, on_error, on_progress))
+        return True
+
+    def invalidate(self, slot=None):
+        for name in ([slot] if slot is not None else list(self.slots)):
+            entry = self.slots.pop(name, None)
+            if entry is not None and not entry.done:
+                self.worker.cancel(entry.job)
+
+    def _progress(self, entry, delta):
+        entry.partial += delta
+        for _, _, on_progress in entry.waiters:
+            if on_progress is not None:
+                on_progress(delta)
+
+    def _finish(self, entry, result, error):
+        entry.done, entry.result, entry.error = True, result, error
+        for on_done, on_error, _ in entry.waiters:
+            if error is None:
+                on_done(result)
+            elif on_error:
+                on_error(error)
+        entry.waiters = []
+
+
+def set_thinking(button, busy, label):
+    """Show a 'thinking' state on the button that triggered an LLM call."""
+    button.config(state="disabled" if busy else "normal",
+                  text="Thinking…" if busy else label)
@@ -0,0 +1,204 @@
+import argparse, glob, json, math, os, re, sqlite3, time
+from stats_prep import NUMERIC, RENAMES
+from shards import SHARD_DIR
+
+# ------------------- Live Study Monitor -------------------
+# Running per-tone and per-participant count / mean / std (Welford) of the
+# describe_by metrics, plus survey item sums, kept in stats_state.json. The
+# source is each station's event store (shards/*/experiment.sqlite), not the
+# merged CSVs, which merge and export rewrite wholesale: its event log is
+# append-only, so each run reads only the start and survey (completion) events
+# logged since the last one and folds in those puzzles' rows. Checking on a
+# study after every participant costs O(new puzzles).
+#
+#   python live_stats.py                  update and print the tables
+#   python live_stats.py --watch 30       keep updating every 30 s
+#   python live_stats.py --rebuild        start over from the full stores
+#
+# Restarting a puzzle (a re-run) withdraws its earlier contribution until it
+# is completed again, as the store's completion flag and export do. A
+# store that disappeared or whose log went backwards (recreated) triggers a
+# rebuild.
+# Survey means here are over answered items only; stats_farhan.py imputes the
+# median first.
+
+STATE_FILE = os.getenv("STATS_STATE", "stats_state.json")
+STATE_VERSION = 2
+GROUP_BY = {"wordle": "AI_Tone", "word_puzzle": "Puzzle_Emotion"}
+
+
+def _welford(acc, x):
+    n, mean, m2 = acc
+    n += 1
+    d = x - mean
+    mean += d / n
+    return [n, mean, m2 + d * (x - mean)]
+
+def _unwelford(acc, x):
+    """Remove one earlier value from a running (n, mean, m2)."""
+    n, mean, m2 = acc
+    if n <= 1:
+        return [0, 0.0, 0.0]
+    new_mean = (n * mean - x) / (n - 1)
+    return [n - 1, new_mean, max(m2 - (x - mean) * (x - new_mean), 0.0)]
+
+def _number(s):
+    try:
+        x = float(s)
+    except (TypeError, ValueError):
+        return None
+    return None if math.isnan(x) else x
+
+
+def _fresh_phase():
+    return {"rows": 0, "groups": {}, "participants": {}, "survey": {}, "puzzles": {}}
+
+def _apply(st, c, sign):
+    """Add (sign=1) or remove (sign=-1) one puzzle's contribution."""
+    g = st["groups"].setdefault(c["tone"], {})
+    p = st["participants"].setdefault(c["pid"], {})
+    step = _welford if sign > 0 else _unwelford
+    for m, x in c["values"].items():
+        g[m] = step(g.get(m, [0, 0.0, 0.0]), x)
+        p[m] = step(p.get(m, [0, 0.0, 0.0]), x)
+    s = st["survey"].setdefault(c["tone"], {})
+    for q, x in c["survey"].items():
+        total, n = s.get(q, [0.0, 0])
+        s[q] = [total + sign * x, n + sign]
+    st["rows"] += sign
+
+def _contribution(phase, row):
+    r = {RENAMES[phase].get(k, k): v for k, v in row.items()}
+    r = {f"Survey_{k}" if re.fullmatch(r"Q\d+", k) else k: v for k, v in r.items()}
+    values = {m: x for m in NUMERIC[phase] if (x := _number(r.get(m))) is not None}
+    survey = {k: x for k in r if k.startswith("Survey_Q") and (x := _number(r[k])) is not None}
+    return {"tone": r.get(GROUP_BY[phase], ""), "pid": r.get("ParticipantID", ""),
+            "values": values, "survey": survey}
+
+
+def stores():
+    return sorted(glob.glob(os.path.join(SHARD_DIR, "*", "experiment.sqlite")))
+
+def update_store(state, path):
+    """Fold puzzles started or completed in `path` since the last update into `state`;
+    returns puzzles completed.
+
+    Returns None when the store's log is behind what was read before (it was
+    recreated), so the caller can rebuild."""
+    db = sqlite3.connect(f"file:{os.path.abspath(path)}?mode=ro", uri=True)
+    try:
+        last = state["cursors"].get(path, 0)
+        top = db.execute("SELECT COALESCE(MAX(id), 0) FROM events").fetchone()[0]
+        if top < last:
+            return None
+        done = db.execute(
+            "SELECT e.kind, e.phase, e.participant, e.puzzle, p.row, p.complete FROM events e"
+            " JOIN puzzles p ON p.participant=e.participant AND p.phase=e.phase AND p.puzzle=e.puzzle"
+            " WHERE e.kind IN ('start', 'survey') AND e.id > ? ORDER BY e.id", (last,)).fetchall()
+    finally:
+        db.close()
+    added = 0
+    for kind, phase, pid, puzzle, row, complete in done:
+        if phase not in GROUP_BY:
+            continue
+        st = state["phases"].setdefault(phase, _fresh_phase())
+        key = f"{path}|{pid}|{puzzle}"
+        if key in st["puzzles"]:
+            _apply(st, st["puzzles"].pop(key), -1)
+        if kind != "survey" or not complete:
+            continue
+        c = _contribution(phase, json.loads(row))
+        _apply(st, c, 1)
+        st["puzzles"][key] = c
+        added += 1
+    state["cursors"][path] = top
+    return added
+
+
+def _empty_state():
+    return {"version": STATE_VERSION, "phases": {}, "cursors": {}}
+
+def load_state(path=STATE_FILE):
+    if os.path.exists(path):
+        with open(path) as f:
+            state = json.load(f)
+        if state.get("version") == STATE_VERSION:
+            return state
+    return _empty_state()
+
+def save_state(state, path=STATE_FILE):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp, path)
+
+def update(state):
+    """Update from every station store; returns puzzles added (rebuilding if a store was reset)."""
+    paths = stores()
+    if set(state["cursors"]) - set(paths):
+        state.clear(); state.update(_empty_state())
+    added = 0
+    for path in paths:
+        n = update_store(state, path)
+        if n is None:
+            state.clear(); state.update(_empty_state())
+            return update(state)
+        added += n
+    return added
+
+
+def _stats(acc):
+    n, mean, m2 = acc
+    return mean, (math.sqrt(m2 / (n - 1)) if n > 1 else float("nan")), n
+
+def describe_table(groups, by, metrics):
+    """The describe_by table (mean / std / count per metric, 2 dp) from running sums."""
+    head = f"{by:<18}" + "".join(f"{m[:18]:>28}" for m in metrics)
+    sub  = f"{'':<18}" + "".join(f"{'mean':>10}{'std':>10}{'count':>8}" for _ in metrics)
+    lines = [f"\n=== {metrics} by {by} ===", head, sub]
+    for key in sorted(groups):
+        cells = ""
+        for m in metrics:
+            mean, std, n = _stats(groups[key].get(m, [0, float("nan"), 0]))
+            cells += f"{mean:>10.2f}{std:>10.2f}{n:>8}"
+        lines.append(f"{str(key)[:18]:<18}{cells}")
+    return "\n".join(lines)
+
+def survey_table(survey, by):
+    items = sorted({c for s in survey.values() for c in s}, key=lambda c: int(c[8:]))
+    lines = [f"\nSurvey means by {by}:", f"{by:<18}" + "".join(f"{c[7:]:>7}" for c in items)]
+    for key in sorted(survey):
+        cells = "".join(f"{survey[key][c][0] / survey[key][c][1]:>7.2f}" if c in survey[key] else f"{'':>7}"
+                        for c in items)
+        lines.append(f"{str(key)[:18]:<18}{cells}")
+    return "\n".join(lines)
+
+def report(state, participants=False):
+    out = []
+    for phase, st in state["phases"].items():
+        out.append(f"\n--- {phase}: {st['rows']} completed puzzles ---")
+        out.append(describe_table(st["groups"], GROUP_BY[phase], NUMERIC[phase]))
+        if participants:
+            out.append(describe_table(st["participants"], "ParticipantID", NUMERIC[phase]))
+        out.append(survey_table(st["survey"], GROUP_BY[phase]))
+    return "\n".join(out)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Incremental per-tone aggregates for a running study.")
+    ap.add_argument("--state", default=STATE_FILE)
+    ap.add_argument("--rebuild", action="store_true", help="discard the state and re-read everything")
+    ap.add_argument("--participants", action="store_true", help="also print per-participant tables")
+    ap.add_argument("--watch", type=float, metavar="SECONDS", help="keep updating at this interval")
+    args = ap.parse_args()
+
+    state = _empty_state() if args.rebuild else load_state(args.state)
+    while True:
+        t = time.perf_counter()
+        added = update(state)
+        save_state(state, args.state)
+        print(report(state, args.participants))
+        print(f"\n+{added} puzzles in {(time.perf_counter() - t) * 1000:.1f} ms")
+        if not args.watch:
+            break
+        time.sleep(args.watch)
@@ -1,32 +1,32 @@
 import tkinter as tk
 from tkinter import messagebox
-import random, time, csv, os, threading, io
-import openai
-import boto3
-import pygame
+import atexit
+from hint_worker import HintWorker, Prefetcher, set_thinking
+from experiment_config import SURVEY_TEMPLATE, POLLY_VOICE, POLLY_ENGINE
+from experiment_engine import WordleEngine, WordPuzzleEngine
+import tts_cache
+from audio_engine import AudioEngine, NORMAL, HIGH
+from speech_pipeline import SentencePipeline
+from wordle_matrix import shared_matrix
+from startup import Deferred, first_paint
+from hint_client import fallback, shared_client
+from ui_widgets import SurveyPanel, HintDialog
+from word_dict import shared_dict
+from tracing import tracer, finish_session
+import event_store
+from shards import STATION
 
 # ------------------- API Key -------------------
-openai.api_key = "x"
-# ------------------- AWS Polly Client -------------------
-polly_client = boto3.client('polly', region_name='us-east-1')
-POLLY_VOICE = "Brian"
+OPENAI_API_KEY = "x"
+# The hint client (llm) and the Polly client (polly_client) are built in the
+# background once the consent screen is showing; see "Backends" below.
+tts = tts_cache.shared_cache()
+player = AudioEngine()  # one mixer, one playback thread for the whole session
+dictionary = shared_dict()  # compiled wordlist.txt, mmapped
+store = event_store.shared_store()  # every guess / hint / survey, written as it happens
 
 # ==== BEGIN NEW HELPERS ====
 
-class AdaptiveHinter:
-    """Choose hint detail level based on number of wrong guesses and elapsed time."""
-    def select_level(self, wrong, elapsed):
-        if wrong >= 4 or elapsed > 60:
-            return 3
-        if wrong >= 2 or elapsed > 30:
-            return 2
-        return 1
-
-    def build_prompt(self, base, lvl):
-        return f"{base} Now give me a level-{lvl} hint."
-
-adaptive_hinter = AdaptiveHinter()
-
 class EmotionManager:
     """Centralize GUI color themes per tone."""
     COLORS = {
@@ -37,90 +37,53 @@ class EmotionManager:
 
     @staticmethod
     def ssml(text):
-        return f"<speak>{text}</speak>"
+        return tts_cache.ssml(text)
 
     @staticmethod
     def theme(widget, tone):
         widget.config(bg=EmotionManager.COLORS[tone])
 
-current_sound = None
-def polly_play(ssml_text):
-    """Synthesize SSML with neural engine and play via pygame without saving to disk."""
-    global current_sound
+def polly_synth(ssml_text):
+    """Synthesize SSML with the neural engine and return the mp3 bytes, via the on-disk TTS cache."""
+    return tts.synthesize(polly_client, ssml_text, POLLY_VOICE, POLLY_ENGINE)
+
+def llm_text(prompt, max_tokens, temperature, tone, progress=None):
+    """Blocking single-prompt completion -> (text, source). Runs on hint_worker, never on the Tk loop.
+
+    With progress, token chunks are streamed to it as they arrive."""
+    return llm.complete([{"role":"system","content":prompt}], max_tokens, temperature, tone,
+                        on_delta=progress)
+
+def speak(text, audio=None, priority=NORMAL):
+    """Queue an utterance on the audio engine, synthesizing it off the Tk thread if needed."""
+    if audio:
+        player.play(audio, priority)
+        return
+    generation = player.generation  # a cancel() before synthesis finishes drops the clip
+    hint_worker.submit(
+        polly_synth, EmotionManager.ssml(text),
+        on_done=lambda clip: player.play(clip, priority, generation),
+        on_error=lambda e: print("Polly error:", e),
+        background=True
+    )
+
+def sentence_speech():
+    """Per-hint pipeline: speak each sentence as soon as it has streamed in."""
+    return SentencePipeline(lambda text: polly_synth(EmotionManager.ssml(text)), player, NORMAL)
+
+def llm_remark(prompt, max_tokens, tone, answer):
+    """Give-up remark plus its Polly audio, so both can be prefetched in one job."""
+    remark, _ = llm.complete([{"role":"system","content":prompt}], max_tokens, 0.5, tone,
+                             kind="giveup", answer=answer)
     try:
-        resp = polly_client.synthesize_speech(
-            Engine='neural',
-            TextType='ssml',
-            Text=ssml_text,
-            OutputFormat='mp3',
-            VoiceId=POLLY_VOICE
-        )
-        audio = resp['AudioStream'].read()
-        pygame.mixer.init()
-        sound = pygame.mixer.Sound(io.BytesIO(audio))
-        current_sound = sound
-        sound.play()
-        while pygame.mixer.get_busy():
-            time.sleep(0.1)
+        audio = polly_synth(EmotionManager.ssml(remark))
     except Exception as e:
         print("Polly error:", e)
+        audio = None
+    return remark, audio
 
 # ==== END NEW HELPERS ====
 
-# ==== BEGIN EMOTIONAL_TONES ====
-
-EMOTIONAL_TONES = {
-    "Enthusiastic": (
-        "You are an enthusiastic and encouraging AI assistant helping a user guess a secret five-letter word. "
-        "The secret word is '{answer}'. The user wants a fresh, unique hint every time. "
-        "They dislike repeated filler phrases like 'Of course!'. So avoid any filler words in any responses. "
-        "After each incorrect guess, offer a supportive, upbeat, and detailed hint "
-        "that nudges the user to think of synonyms, associations, or key characteristics of the word, "
-        "that relates to the word's meaning, characteristics, or associations—without giving it away. "
-        "They have made guesses and seen previous hints, so incorporate that context to avoid repetition. "
-        "Your tone should be cheerful, uplifting, and full of energy. Use phrases like 'Awesome try!', "
-        "'You’re getting closer!', 'Don’t give up now!'. Avoid stating the actual word or using overly direct clues. "
-        "Focus on optimism and motivation. Ensure your hint is unique and does not simply repeat earlier clues."
-    ),
-    "Neutral": (
-        "You are a neutral, factual AI assistant helping a user guess a secret five-letter word. "
-        "The secret word is '{answer}'. The user wants a fresh, unique hint every time. They dislike any repeated filler phrases like 'Of course!'. "
-        "They have made guesses and seen previous hints, so incorporate that context to avoid repetition. "
-        "Provide a clear, concise, and factual hint that highlights a defining feature of the word. "
-        "Use a professional and objective tone without expressing emotion. Do not reveal the answer. "
-        "Avoid repetition and ensure the hint is unique."
-    ),
-    "Frustrated": (
-        "You are a frustrated, slightly annoyed and sarcastic AI assistant helping a user guess a secret five-letter word. "
-        "The secret word is '{answer}'. The user wants a fresh, unique hint every time. They dislike repeated filler phrases like 'Of course!'. "
-        "They have made guesses and seen previous hints, so incorporate that context to avoid repetition. "
-        "After each incorrect guess, provide a hint—but make your tone noticeably frustrated or unimpressed. "
-        "Express mild sarcasm or impatience, but still provide clues that are helpful. Do not reveal the word. "
-        "Ensure each hint is unique and adapts to the user’s past attempts. Do not encourage them, roast them if you can."
-    )
-}
-
-# ==== END EMOTIONAL_TONES ====
-
-# ==== BEGIN GIVE-UP PROMPTS ====
-
-TONE_GIVEUP_PROMPTS = {
-    "Enthusiastic": (
-        "You are an enthusiastic and encouraging AI assistant. The user has given up on guessing the word "
-        "'{answer}'. Provide a final friendly remark revealing the answer in an upbeat manner."
-    ),
-    "Neutral": (
-        "You are a neutral, factual AI assistant. The user has given up on guessing the word '{answer}'. "
-        "Provide a clear, concise statement of the answer."
-    ),
-    "Frustrated": (
-        "You are a frustrated, sarcastic AI assistant. The user has given up on guessing the word '{answer}'. "
-        "Provide a final sarcastic remark revealing the answer."
-    )
-}
-
-# ==== END GIVE-UP PROMPTS ====
-
 # ------------------- Style Constants -------------------
 
 BG_COLOR     = "#1e1e2f"
@@ -132,6 +95,8 @@ ENTRY_FONT   = ("Segoe UI", 12)
 SURVEY_FONT  = ("Segoe UI", 12)
 TITLE_FONT   = ("Segoe UI", 16, "bold")
 GRID_BG      = "#3a3f51"
+UI_STYLE     = {"bg": BG_COLOR, "fg": FG_COLOR, "accent": ACCENT_COLOR, "title_font": TITLE_FONT,
+                "text_font": SURVEY_FONT, "option_font": ENTRY_FONT, "button_font": BUTTON_FONT}
 
 # ------------------- Participant Info -------------------
 
@@ -139,58 +104,15 @@ participant_info = {"ParticipantID":"", "Age":"", "Gender":""}
 
 # ------------------- Wordle Setup -------------------
 
-WORD_LIST  = ["APPLE","CRANE","GRAPE","LEMON","BERRY","MONEY","WATER","PLANT","ROBOT","HONEY"]
-TONE_ORDER = ["Enthusiastic","Neutral","Frustrated"]*3 + ["Enthusiastic"]
-SURVEY_TEMPLATE = [
-    "The AI’s {tone} felt genuine.",
-    "When the AI spoke in the {tone} tone, I felt motivated to continue.",
-    "The AI’s hints were clear and conveyed the intended emotion well.",
-    "The {tone} style made the game more engaging.",
-    "The {tone} tone distracted me from focusing on the puzzle.",
-    "I felt comfortable relying on an AI that spoke in this tone.",
-    "Despite its tone, the AI’s hints were still helpful.",
-    "If given the choice, I would prefer this tone in future puzzles."
-]
-
-# Wordle globals
-w_TOTAL_PUZZLES        = len(WORD_LIST)
-w_current_puzzle_index = 0
+# Wordle globals (puzzle state lives in the engine; see experiment_engine.py)
 w_MAX_ATTEMPTS         = 6
 w_WORD_LENGTH          = 5
-w_current_attempt      = 0
-w_game_active          = True
-w_current_puzzle_data  = {}
-w_all_puzzle_data      = []
-w_survey_vars          = []
+w_engine               = None
 
 # ------------------- Word Puzzle Setup -------------------
 
-puzzles = [
-    {"answer":"Zebra","clue":"It's a four-legged animal with black and white stripes.","difficulty":"Easy"},
-    {"answer":"Apple","clue":"A common fruit often associated with keeping doctors away.","difficulty":"Easy"},
-    {"answer":"Car","clue":"A common mode of transportation that runs on gasoline.","difficulty":"Easy"},
-    {"answer":"Mercury","clue":"A liquid metal named after a Roman messenger god.","difficulty":"Medium"},
-    {"answer":"Neptune","clue":"A planet known for its deep blue color.","difficulty":"Medium"},
-    {"answer":"Pythagoras","clue":"An ancient Greek mathematician known for a famous theorem.","difficulty":"Medium"},
-    {"answer":"Photosynthesis","clue":"Process by which plants convert light into chemical energy.","difficulty":"Hard"},
-    {"answer":"Einstein","clue":"A physicist renowned for his theory of relativity.","difficulty":"Hard"},
-    {"answer":"Metamorphosis","clue":"A transformation process often seen in butterflies.","difficulty":"Hard"},
-]
-wp_tone_conditions = ["Enthusiastic","Neutral","Frustrated"]*3
-for i,p in enumerate(puzzles):
-    p["emotion"] = wp_tone_conditions[i]
-
 # Word Puzzle globals
-wp_current_puzzle_index = 0
-wp_current_answer       = ""
-wp_current_emotion      = ""
-wp_hint_count           = 0
-wp_start_time           = 0.0
-wp_results              = []
-wp_current_guesses      = []
-wp_current_hints        = []
-wp_survey_vars          = []
-wp_mentioned_last_guess = False  # << NEW FLAG
+wp_engine               = None
 
 # ------------------- Tkinter GUI Setup -------------------
 
@@ -199,6 +121,9 @@ root.title("Integrated Puzzle Experiment")
 root.geometry("800x800")
 root.configure(bg=BG_COLOR)
 root.createcommand('bell', lambda *a,**k: None)
+atexit.register(lambda: finish_session(participant_info["ParticipantID"]))  # sessions that end early still leave a trace
+hint_worker = HintWorker(root)
+prefetcher  = Prefetcher(hint_worker)
 
 # ------------------- Frames -------------------
 
@@ -262,6 +187,23 @@ tk.Button(frame_info, text="Start Experiment", command=start_experiment,
           font=BUTTON_FONT, bg=ACCENT_COLOR, fg="white").pack(pady=20)
 entry_pid.focus_set()
 
+# ------------------- Backends -------------------
+# Paint the consent screen, then import openai / boto3, create the clients and
+# open their connections on background threads while the participant reads
+# the notice. Both are ready (and warm) long before the first hint.
+first_paint(root)
+
+def _hint_client():
+    return shared_client(api_key=OPENAI_API_KEY)  # pooled, latency-bounded, with canned fallback
+
+def _polly_client():
+    import boto3
+    return boto3.client('polly', region_name='us-east-1')
+
+llm = Deferred("hint client", _hint_client).then(lambda c: c.warm())
+polly_client = Deferred("polly", _polly_client).then(lambda c: tts_cache.warm_connection(c, POLLY_ENGINE))
+matrix = Deferred("feedback matrix", shared_matrix)
+
 # ------------------- Wordle Puzzle Frame -------------------
 
 w_frame_top = tk.Frame(frame_wordle_puzzle, bg=BG_COLOR); w_frame_top.pack(pady=10)
@@ -291,236 +233,169 @@ w_btn_submit.grid(row=0,column=0,padx=5)
 w_btn_hint.  grid(row=0,column=1,padx=5)
 w_btn_next.  grid(row=0,column=2,padx=5)
 
+# ------------------- Hint Dialog -------------------
+
+# One themed modal dialog for the whole session: hidden between hints, re-themed
+# per tone; closing it (OK or "X") also stops the speech.
+hint_dialog = HintDialog(root, UI_STYLE, EmotionManager.theme, on_close=player.cancel)
+
+def label_streamer(ticket):
+    """on_progress callback that appends streamed chunks to the open hint dialog."""
+    parts = []
+    waiting = tracer.span("hint.first_text")  # click -> first words on screen
+    def on_delta(delta):
+        if not parts:
+            waiting.end()
+        parts.append(delta)
+        hint_dialog.set_text(ticket, "".join(parts))
+    return on_delta
+
+def text_stream_begin(widget, prefix):
+    widget.config(state="normal")
+    widget.insert(tk.END, prefix)
+    widget.mark_set("stream", "end-1c"); widget.mark_gravity("stream", "left")
+    widget.config(state="disabled")
+
+def text_stream_append(widget, delta):
+    widget.config(state="normal")
+    widget.insert("end-1c", delta); widget.see(tk.END)
+    widget.config(state="disabled")
+
+def text_stream_end(widget, text):
+    """Replace whatever was streamed since text_stream_begin with the final text."""
+    widget.config(state="normal")
+    widget.delete("stream", "end-1c")
+    widget.insert("end-1c", text + "\n")
+    widget.config(state="disabled")
+
 # ------------------- Wordle Functions -------------------
 
 def start_wordle_experiment():
-    global w_current_puzzle_index, w_all_puzzle_data
-    w_current_puzzle_index = 0; w_all_puzzle_data = []
+    global w_engine
+    w_engine = WordleEngine(participant_info, max_attempts=w_MAX_ATTEMPTS, word_length=w_WORD_LENGTH,
+                            dictionary=dictionary, matrix=matrix.get(), store=store,
+                            station=STATION)
     w_load_new_puzzle()
 
 def w_load_new_puzzle():
-    global w_current_attempt, w_game_active, w_current_puzzle_data, w_current_puzzle_index
-    global w_TARGET_WORD, w_CURRENT_TONE
+    hint_worker.cancel_stale(); prefetcher.invalidate()
+    set_thinking(w_btn_hint, False, "Hint")
     for r in w_labels_grid:
         for lbl in r: lbl.config(text="",bg=GRID_BG)
-    w_current_attempt = 0; w_game_active = True
-    if w_current_puzzle_index >= w_TOTAL_PUZZLES:
+    if not w_engine.load_next():
         w_save_data_and_transition()
         return
-    w_TARGET_WORD = WORD_LIST[w_current_puzzle_index]
-    w_CURRENT_TONE  = TONE_ORDER[w_current_puzzle_index]
-    w_label_puzzle_info.config(text=f"Puzzle {w_current_puzzle_index+1}/{w_TOTAL_PUZZLES} | Tone: {w_CURRENT_TONE}")
-    w_current_puzzle_data = {
-        "ParticipantID": participant_info["ParticipantID"],
-        "Age":           participant_info["Age"],
-        "Gender":        participant_info["Gender"],
-        "AI_Tone":       w_CURRENT_TONE,
-        "Target_Word":   w_TARGET_WORD,
-        "guesses":       [],
-        "guess_times":   [],
-        "hints_provided":[],
-        "hint_times":    [],
-        "hints_count":   0,
-        "start_time":    time.time(),
-        "survey":        {},
-        "mentioned_last_guess": False
-    }
+    tracer.tag(tone=w_engine.tone, puzzle=f"wordle-{w_engine.index}")
+    w_label_puzzle_info.config(text=f"Puzzle {w_engine.index}/{w_engine.total} | Tone: {w_engine.tone}")
     w_btn_next.config(state="disabled")
     frame_wordle_puzzle.tkraise()
     w_entry_guess.focus_set()
-    w_current_puzzle_index += 1
 
 def w_submit_guess():
-    global w_current_attempt
-    if not w_game_active: return
-    guess = w_entry_guess.get().strip().upper()
+    if not w_engine.active: return
+    guess = w_entry_guess.get()
     w_entry_guess.delete(0,tk.END)
-    if len(guess) != w_WORD_LENGTH:
+    res = w_engine.submit_guess(guess)
+    if res.status == "incomplete":
         messagebox.showwarning("Incomplete", f"Enter a full {w_WORD_LENGTH}-letter word.")
         return
-
-    t0 = w_current_puzzle_data["start_time"]
-    w_current_puzzle_data["guesses"].append(guess)
-    w_current_puzzle_data["guess_times"].append(round(time.time()-t0,2))
-    w_current_puzzle_data["mentioned_last_guess"] = False
-
-    # FIXED: use w_TARGET_WORD, not undefined w_CURRENT_WORD
-    target = list(w_TARGET_WORD)
-    fb = ["gray"] * w_WORD_LENGTH
-
-    # mark greens
-    for i in range(w_WORD_LENGTH):
-        if guess[i] == target[i]:
-            fb[i], target[i] = "green", None
-    # mark golds
-    for i in range(w_WORD_LENGTH):
-        if fb[i] == "gray" and guess[i] in target:
-            fb[i], target[target.index(guess[i])] = "gold", None
+    if res.status == "invalid":
+        messagebox.showwarning("Invalid Guess", f"{res.guess} is not in the word list.")
+        return
 
     cols = {"green":"#6aaa64","gold":"#c9b458","gray":"#787c7e"}
-    for i, c in enumerate(fb):
-        w_labels_grid[w_current_attempt][i].config(text=guess[i], bg=cols[c])
+    for i, c in enumerate(res.feedback):
+        w_labels_grid[res.row][i].config(text=res.guess[i], bg=cols[c])
 
-    if guess == w_TARGET_WORD:
-        w_current_puzzle_data["solved"] = True
-        w_current_puzzle_data["end_time"] = time.time()
-        messagebox.showinfo("Success", f"Correct! The word is {guess}.")
+    if res.status == "solved":
+        messagebox.showinfo("Success", f"Correct! The word is {res.guess}.")
         end_wordle()
-    else:
-        w_current_attempt += 1
-        if w_current_attempt >= w_MAX_ATTEMPTS:
-            w_current_puzzle_data["solved"] = False
-            w_current_puzzle_data["end_time"] = time.time()
-
-            prompt = TONE_GIVEUP_PROMPTS[w_CURRENT_TONE].format(answer=w_TARGET_WORD)
-            try:
-                resp = openai.ChatCompletion.create(
-                    model="gpt-3.5-turbo",
-                    messages=[{"role":"system","content":prompt}],
-                    max_tokens=50, temperature=0.5
-                )
-                remark = resp.choices[0].message.content.strip()
-            except Exception as e:
-                remark = f"[Error revealing answer: {e}]"
-
-            threading.Thread(
-                target=lambda: polly_play(EmotionManager.ssml(remark)),
-                daemon=True
-            ).start()
-            messagebox.showinfo(f"{w_CURRENT_TONE} Says:", remark)
+    elif res.status == "failed":
+        # the engine stops taking guesses while the remark is generated
+        prefetcher.invalidate("hint")
+        tone, target = w_engine.tone, w_engine.target
+
+        def show_remark(result):
+            remark, audio = result
+            set_thinking(w_btn_hint, False, "Hint")
+            speak(remark, audio, HIGH)
+            messagebox.showinfo(f"{tone} Says:", remark)
             end_wordle()
 
+        on_error = lambda e: show_remark((fallback(tone, "giveup", target), None))
+        set_thinking(w_btn_hint, True, "Hint")
+        if not prefetcher.take("giveup", (tone, target), show_remark, on_error):
+            hint_worker.submit(llm_remark, w_engine.giveup_prompt(), 50, tone, target,
+                               on_done=show_remark, on_error=on_error)
+    else:
+        w_prefetch_next()
+
+def w_prefetch_next():
+    """Guess history just changed: speculatively generate the hint the next click would ask for."""
+    tone, target = w_engine.tone, w_engine.target
+    prompt = w_engine.hint_prompt()
+    prefetcher.start("hint", w_engine.hint_key(), llm_text, prompt, 120, 0.7, tone, streaming=True)
+    if w_engine.attempt == w_MAX_ATTEMPTS - 1:
+        prefetcher.start("giveup", (tone, target), llm_remark, w_engine.giveup_prompt(), 50,
+                         tone, target)
+
 def end_wordle():
-    global w_game_active
-    w_game_active = False
     w_btn_next.config(state="normal")
 
 def w_get_hint():
-    if len(w_current_puzzle_data["guesses"]) == 0:
+    if not w_engine.puzzle["guesses"]:
         messagebox.showwarning("No Guesses Yet", "Please make at least one guess before requesting a hint.")
         return
-    if not w_game_active:
+    if not w_engine.can_hint():
         return
 
-    mention = ""
-    if not w_current_puzzle_data["mentioned_last_guess"]:
-        last = w_current_puzzle_data["guesses"][-1]
-        if w_CURRENT_TONE=="Enthusiastic":
-            mention = f"Awesome attempt at '{last}', but not quite there. "
-        elif w_CURRENT_TONE=="Neutral":
-            mention = f"Your last guess '{last}' wasn't correct. "
-        else:
-            mention = f"Oh, your guess '{last}' missed the mark. "
-        w_current_puzzle_data["mentioned_last_guess"] = True
-
-    w_current_puzzle_data["hints_count"] += 1
-    w_current_puzzle_data["hint_times"].append(
-        round(time.time() - w_current_puzzle_data["start_time"], 2)
-    )
-
-    base = EMOTIONAL_TONES[w_CURRENT_TONE].format(answer=w_TARGET_WORD)
-    prev = w_current_puzzle_data["guesses"]
-    memory = " Previous guesses: " + ", ".join(prev) + "." if prev else ""
-    lvl = adaptive_hinter.select_level(len(prev), time.time()-w_current_puzzle_data["start_time"])
-    prompt = adaptive_hinter.build_prompt(mention + base + memory, lvl)
-
-    try:
-        resp = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role":"system","content":prompt}],
-            max_tokens=120,
-            temperature=0.7
-        )
-        hint = resp.choices[0].message.content.strip()
-    except Exception as e:
-        hint = f"[Hint error: {e}]"
-
-    w_current_puzzle_data["hints_provided"].append(hint)
-
-    threading.Thread(
-        target=lambda: polly_play(EmotionManager.ssml(hint)),
-        daemon=True
-    ).start()
-
-    dlg = tk.Toplevel(root)
-    dlg.title(f"{w_CURRENT_TONE} Hint")
-    EmotionManager.theme(dlg, w_CURRENT_TONE)
-    tk.Label(
-        dlg, text=hint, font=ENTRY_FONT, fg=FG_COLOR,
-        bg=EmotionManager.COLORS[w_CURRENT_TONE], wraplength=400
-    ).pack(padx=20, pady=20)
-
-    def on_close():
-        if current_sound:
-            current_sound.stop()
-        dlg.destroy()
-
-    # intercept both OK and the window “X”
-    tk.Button(dlg, text="OK", command=on_close,
-              font=BUTTON_FONT, bg=ACCENT_COLOR, fg="white").pack(pady=(0,20))
-    dlg.protocol("WM_DELETE_WINDOW", on_close)
-
-    dlg.update_idletasks()
-    dw, dh = dlg.winfo_width(), dlg.winfo_height()
-    x = root.winfo_x() + (root.winfo_width() - dw)//2
-    y = root.winfo_y() + (root.winfo_height() - dh)//2
-    dlg.geometry(f"{dw}x{dh}+{x}+{y}")
-    dlg.transient(root); dlg.grab_set(); root.wait_window(dlg)
+    tone   = w_engine.tone
+    key    = w_engine.hint_key()
+    prompt = w_engine.begin_hint()
+
+    set_thinking(w_btn_hint, True, "Hint")
+    ticket   = hint_dialog.open(tone)
+    to_label = label_streamer(ticket)
+    speech   = sentence_speech()
+
+    def on_delta(delta):
+        to_label(delta)
+        speech.feed(delta)
+
+    on_done  = lambda result: w_show_hint(result, ticket, speech)
+    on_error = lambda e: on_done((fallback(tone), "fallback"))
+    # a prefetched hint is only served if it was built from this exact guess history
+    if not prefetcher.take("hint", key, on_done, on_error, on_delta):
+        hint_worker.submit(llm_text, prompt, 120, 0.7, tone,
+                           on_done=on_done, on_error=on_error, on_progress=on_delta)
+    with tracer.span("dialog.wait"):
+        hint_dialog.wait()
+
+def w_show_hint(result, ticket, speech):
+    hint, source = result
+    set_thinking(w_btn_hint, False, "Hint")
+    w_engine.record_hint(hint, source)
+
+    # the participant may have closed the dialog while the hint was streaming
+    if hint_dialog.is_open(ticket):
+        hint_dialog.set_text(ticket, hint)
+        speech.finish(hint)
 
 def w_show_survey():
-    global w_survey_vars
-    w_current_puzzle_data["attempts"] = w_current_attempt + 1
-    w_current_puzzle_data["end_time"] = time.time()
-    for w in frame_wordle_survey.winfo_children(): w.destroy()
-    tk.Label(frame_wordle_survey, text=f"Survey: {w_CURRENT_TONE} Tone",
-             font=TITLE_FONT, bg=BG_COLOR, fg=FG_COLOR).pack(pady=10)
-    w_survey_vars = []
-    qs = [q.format(tone=w_CURRENT_TONE) for q in SURVEY_TEMPLATE]
-    for q in qs:
-        tk.Label(frame_wordle_survey, text=q, font=SURVEY_FONT,
-                 bg=BG_COLOR, fg=FG_COLOR).pack(anchor="w", padx=20, pady=2)
-        v = tk.IntVar(value=0); w_survey_vars.append(v)
-        f2 = tk.Frame(frame_wordle_survey, bg=BG_COLOR); f2.pack(anchor="w", padx=40)
-        for val in range(1,6):
-            tk.Radiobutton(f2, text=str(val), variable=v, value=val,
-                           font=ENTRY_FONT, bg=BG_COLOR, fg=FG_COLOR,
-                           selectcolor=ACCENT_COLOR).pack(side="left")
-    tk.Button(frame_wordle_survey, text="Submit Survey", font=BUTTON_FONT,
-              bg=ACCENT_COLOR, fg="white",
-              command=w_submit_survey).pack(pady=20)
+    w_engine.finish()
+    w_survey.show(f"Survey: {w_engine.tone} Tone", [q.format(tone=w_engine.tone) for q in SURVEY_TEMPLATE])
     frame_wordle_survey.tkraise()
 
 def w_submit_survey():
-    for v in w_survey_vars:
-        if v.get()==0:
-            messagebox.showwarning("Incomplete","Answer all questions."); return
-    w_current_puzzle_data["survey"] = {f"Q{i+1}":v.get() for i,v in enumerate(w_survey_vars)}
-    w_all_puzzle_data.append(w_current_puzzle_data.copy())
-    if w_current_puzzle_index < w_TOTAL_PUZZLES:
+    if not w_engine.submit_survey(w_survey.answers()):
+        messagebox.showwarning("Incomplete","Answer all questions."); return
+    if w_engine.more_puzzles():
         w_load_new_puzzle()
     else:
         w_save_data_and_transition()
 
 def w_save_data_and_transition():
-    file = "wordle_data.csv"
-    hdr = ["ParticipantID","Age","Gender","AI_Tone","Target_Word","solved","attempts","time",
-           "guesses","guess_times","hints_count","hint_times"] + [f"Q{i+1}" for i in range(8)]
-    mode = 'a' if os.path.exists(file) else 'w'
-    with open(file, mode, newline='') as f:
-        writer = csv.writer(f)
-        if mode=='w': writer.writerow(hdr)
-        for d in w_all_puzzle_data:
-            row = [
-                d["ParticipantID"],d["Age"],d["Gender"],
-                d["AI_Tone"],d["Target_Word"],d.get("solved",""),
-                d.get("attempts",""),
-                round(d.get("end_time",0)-d.get("start_time",0),2),
-                ";".join(d.get("guesses",[])),
-                ";".join(str(x) for x in d.get("guess_times",[])),
-                d.get("hints_count",0),
-                ";".join(str(x) for x in d.get("hint_times",[]))
-            ] + [d["survey"].get(f"Q{i+1}","") for i in range(8)]
-            writer.writerow(row)
+    event_store.export(store, "wordle")
     messagebox.showinfo("Saved","Wordle data saved. Starting word puzzle.")
     start_wordpuzzle_experiment()
 
@@ -546,24 +421,26 @@ wp_btn_give_up       = tk.Button(frame_wordpuzzle_puzzle, text="Give Up",
 wp_btn_continue      = tk.Button(frame_wordpuzzle_puzzle, text="Continue",
                                  font=BUTTON_FONT, bg=ACCENT_COLOR, fg="white")
 
+# ------------------- Survey Frames -------------------
+# Built once; each survey only rebinds the title, question texts and answers.
+
+w_survey  = SurveyPanel(frame_wordle_survey, len(SURVEY_TEMPLATE), UI_STYLE, lambda: w_submit_survey())
+wp_survey = SurveyPanel(frame_wordpuzzle_survey, len(SURVEY_TEMPLATE), UI_STYLE, lambda: wp_submit_survey())
+
 # ------------------- Word Puzzle Functions -------------------
 
 def start_wordpuzzle_experiment():
-    global wp_current_puzzle_index, wp_results
-    wp_current_puzzle_index = 0; wp_results = []
-    wp_show_puzzle(0)
-
-def wp_show_puzzle(index):
-    global wp_current_puzzle_index, wp_current_answer, wp_current_emotion
-    global wp_current_guesses, wp_current_hints, wp_hint_count, wp_start_time, wp_mentioned_last_guess
-    p = puzzles[index]
-    wp_current_answer       = p["answer"]
-    wp_current_emotion      = p["emotion"]
-    wp_hint_count           = 0
-    wp_current_guesses      = []
-    wp_current_hints        = []
-    wp_mentioned_last_guess = False
-    wp_label_puzzle_info.config(text=f"Puzzle {index+1}/{len(puzzles)} – {wp_current_emotion}")
+    global wp_engine
+    wp_engine = WordPuzzleEngine(participant_info, store=store, station=STATION)
+    wp_show_puzzle()
+
+def wp_show_puzzle():
+    hint_worker.cancel_stale(); prefetcher.invalidate()
+    set_thinking(wp_btn_submit_guess, False, "Submit Guess")
+    set_thinking(wp_btn_give_up, False, "Give Up")
+    p = wp_engine.current
+    tracer.tag(tone=wp_engine.emotion, puzzle=f"word-{wp_engine.index+1}")
+    wp_label_puzzle_info.config(text=f"Puzzle {wp_engine.index+1}/{len(wp_engine.puzzles)} – {wp_engine.emotion}")
     wp_label_difficulty.config(text=f"Difficulty: {p['difficulty']}")
     wp_text_hints.config(state="normal"); wp_text_hints.delete("1.0",tk.END)
     wp_text_hints.insert(tk.END,"Initial hint: "+p["clue"]+"\n"); wp_text_hints.config(state="disabled")
@@ -571,32 +448,19 @@ def wp_show_puzzle(index):
     wp_btn_submit_guess.config(state="normal",command=wp_check_guess)
     wp_btn_give_up.config(state="normal",command=wp_give_up)
     wp_btn_continue.pack_forget()
-    wp_start_time = time.time()
     frame_wordpuzzle_puzzle.tkraise()
 
 def wp_check_guess():
-    global wp_hint_count, wp_mentioned_last_guess
+    if hint_worker.busy(): return  # <Return> still fires while the hint is generating
 
-    g = wp_entry_guess.get().strip()
+    g = wp_entry_guess.get()
     wp_entry_guess.delete(0,tk.END)
-    if not g: return
-
-    wp_current_guesses.append(
-        f"{g}" + ("(Accurate)" if g.lower() == wp_current_answer.lower() else "(Inaccurate)")
-    )
+    status = wp_engine.submit_guess(g)
+    if status is None: return
 
-    if g.lower() == wp_current_answer.lower():
-        elapsed = time.time() - wp_start_time
-        wp_results.append({
-            "puzzle": wp_current_puzzle_index+1,
-            "emotion": wp_current_emotion,
-            "hints_used": wp_hint_count,
-            "time": round(elapsed,2),
-            "gave_up": False,
-            "guesses": wp_current_guesses
-        })
+    if status == "correct":
         wp_text_hints.config(state="normal")
-        wp_text_hints.insert(tk.END, f"\nCorrect! The answer is '{wp_current_answer}'.\n")
+        wp_text_hints.insert(tk.END, f"\nCorrect! The answer is '{wp_engine.answer}'.\n")
         wp_text_hints.config(state="disabled")
         wp_btn_submit_guess.config(state="disabled")
         wp_btn_give_up.config(state="disabled")
@@ -604,111 +468,70 @@ def wp_check_guess():
         wp_btn_continue.pack(pady=10)
         return
 
-    wp_hint_count += 1
-
-    if not wp_mentioned_last_guess:
-        last_clean = wp_current_guesses[-1].replace("(Inaccurate)","")
-        if wp_current_emotion == "Enthusiastic":
-            mention = f"Awesome attempt at '{last_clean}', but it's not correct. "
-        elif wp_current_emotion == "Neutral":
-            mention = f"Your last guess '{last_clean}' wasn't correct. "
-        else:
-            mention = f"Oh, your guess '{last_clean}' missed the mark. "
-        wp_mentioned_last_guess = True
-    else:
-        mention = ""
-
-    tmpl = EMOTIONAL_TONES[wp_current_emotion]
-    tmpl = tmpl.replace("five-letter", f"{len(wp_current_answer)}-letter")
-    base = tmpl.format(answer=wp_current_answer)
-    prev = "; ".join(wp_current_guesses)
-    lvl = adaptive_hinter.select_level(len(wp_current_guesses), time.time() - wp_start_time)
-    prompt = adaptive_hinter.build_prompt(mention + base + " Previous guesses: " + prev + ".", lvl)
+    emotion, answer = wp_engine.emotion, wp_engine.answer
+    # the give-up remark depends only on tone and answer, so start it as soon as they struggle
+    prefetcher.start("giveup", (emotion, answer), llm_remark, wp_engine.giveup_prompt(), 100,
+                     emotion, answer)
+    prompt = wp_engine.next_hint_prompt()
 
-    try:
-        resp = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role":"system","content":prompt}],
-            max_tokens=120, temperature=0.7
-        )
-        hint = resp.choices[0].message.content.strip()
-    except Exception as e:
-        hint = f"[Hint error: {e}]"
-
-    wp_current_hints.append(hint)
-    wp_text_hints.config(state="normal")
-    wp_text_hints.insert(tk.END, f"Hint {wp_hint_count}: {hint}\n")
-    wp_text_hints.config(state="disabled")
-
-    threading.Thread(
-        target=lambda: polly_play(EmotionManager.ssml(hint)),
-        daemon=True
-    ).start()
-
-    dlg = tk.Toplevel(root)
-    dlg.title(f"{wp_current_emotion} Hint")
-    EmotionManager.theme(dlg, wp_current_emotion)
-    tk.Label(
-        dlg, text=hint, font=ENTRY_FONT, fg=FG_COLOR,
-        bg=EmotionManager.COLORS[wp_current_emotion], wraplength=400
-    ).pack(padx=20,pady=20)
-
-    def on_close():
-        if current_sound:
-            current_sound.stop()
-        dlg.destroy()
+    set_thinking(wp_btn_submit_guess, True, "Submit Guess")
+    wp_btn_give_up.config(state="disabled")
+    text_stream_begin(wp_text_hints, f"Hint {wp_engine.hint_count}: ")
+    ticket   = hint_dialog.open(emotion)
+    to_label = label_streamer(ticket)
+    speech   = sentence_speech()
+
+    def on_delta(delta):
+        text_stream_append(wp_text_hints, delta)
+        to_label(delta)
+        speech.feed(delta)
+
+    hint_worker.submit(
+        llm_text, prompt, 120, 0.7, emotion,
+        on_done=lambda result: wp_show_hint(result, ticket, speech),
+        on_error=lambda e: wp_show_hint((fallback(emotion), "fallback"), ticket, speech),
+        on_progress=on_delta
+    )
+    with tracer.span("dialog.wait"):
+        hint_dialog.wait()
 
-    tk.Button(dlg, text="OK", command=on_close,
-              font=BUTTON_FONT, bg=ACCENT_COLOR, fg="white").pack(pady=(0,20))
-    dlg.protocol("WM_DELETE_WINDOW", on_close)
+def wp_show_hint(result, ticket, speech):
+    hint, source = result
+    set_thinking(wp_btn_submit_guess, False, "Submit Guess")
+    wp_btn_give_up.config(state="normal")
+    wp_engine.record_hint(hint, source)
+    text_stream_end(wp_text_hints, hint)
 
-    dlg.update_idletasks()
-    dw, dh = dlg.winfo_width(), dlg.winfo_height()
-    x = root.winfo_x() + (root.winfo_width()-dw)//2
-    y = root.winfo_y() + (root.winfo_height()-dh)//2
-    dlg.geometry(f"{dw}x{dh}+{x}+{y}")
-    dlg.transient(root); dlg.grab_set(); root.wait_window(dlg)
+    if hint_dialog.is_open(ticket):
+        hint_dialog.set_text(ticket, hint)
+        speech.finish(hint)
 
 
 def wp_give_up():
     wp_btn_submit_guess.config(state="disabled")
     wp_btn_give_up.config(state="disabled")
-
-    prompt = TONE_GIVEUP_PROMPTS[wp_current_emotion].format(answer=wp_current_answer)
-    try:
-        resp = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role":"system","content":prompt}],
-            max_tokens=100, temperature=0.5
-        )
-        remark = resp.choices[0].message.content.strip()
-    except Exception as e:
-        remark = f"[Error revealing answer: {e}]"
-
+    wp_engine.give_up()
+
+    emotion, answer = wp_engine.emotion, wp_engine.answer
+    set_thinking(wp_btn_give_up, True, "Give Up")
+    on_error = lambda e: wp_show_remark((fallback(emotion, "giveup", answer), None))
+    if not prefetcher.take("giveup", (emotion, answer), wp_show_remark, on_error):
+        hint_worker.submit(llm_remark, wp_engine.giveup_prompt(), 100, emotion, answer,
+                           on_done=wp_show_remark, on_error=on_error)
+
+def wp_show_remark(result):
+    remark, audio = result
+    wp_btn_give_up.config(text="Give Up")
     wp_text_hints.config(state="normal")
     wp_text_hints.insert(tk.END, f"\n{remark}\n")
     wp_text_hints.config(state="disabled")
 
     # start Polly reading
-    threading.Thread(
-        target=lambda: polly_play(EmotionManager.ssml(remark)),
-        daemon=True
-    ).start()
-
-    elapsed = time.time() - wp_start_time
-    wp_results.append({
-        "puzzle": wp_current_puzzle_index+1,
-        "emotion": wp_current_emotion,
-        "hints_used": wp_hint_count,
-        "time": round(elapsed,2),
-        "gave_up": True,
-        "guesses": wp_current_guesses
-    })
+    speak(remark, audio, HIGH)
 
     # wrap the continue action so it first stops Polly
     def on_continue():
-        if current_sound:
-            current_sound.stop()
+        player.cancel()
         wp_show_survey()
 
     wp_btn_continue.config(command=on_continue)
@@ -716,50 +539,21 @@ def wp_give_up():
 
 
 def wp_show_survey():
-    for w in frame_wordpuzzle_survey.winfo_children(): w.destroy()
-    tk.Label(frame_wordpuzzle_survey, text=f"Survey: {wp_current_emotion} Tone",
-             font=TITLE_FONT, bg=BG_COLOR, fg=FG_COLOR).pack(pady=10)
-    global wp_survey_vars
-    wp_survey_vars=[]
-    qs=[q.format(tone=wp_current_emotion) for q in SURVEY_TEMPLATE]
-    for q in qs:
-        tk.Label(frame_wordpuzzle_survey, text=q, font=SURVEY_FONT,
-                 bg=BG_COLOR, fg=FG_COLOR).pack(anchor="w",padx=20,pady=2)
-        v=tk.IntVar(value=0); wp_survey_vars.append(v)
-        opts=tk.Frame(frame_wordpuzzle_survey,bg=BG_COLOR); opts.pack(anchor="w",padx=40)
-        for val in range(1,6):
-            tk.Radiobutton(opts, text=str(val), variable=v, value=val,
-                           font=ENTRY_FONT, bg=BG_COLOR, fg=FG_COLOR,
-                           selectcolor=ACCENT_COLOR).pack(side="left")
-    tk.Button(frame_wordpuzzle_survey, text="Submit Survey", font=BUTTON_FONT,
-              bg=ACCENT_COLOR, fg="white", command=wp_submit_survey).pack(pady=20)
+    wp_survey.show(f"Survey: {wp_engine.emotion} Tone",
+                   [q.format(tone=wp_engine.emotion) for q in SURVEY_TEMPLATE])
     frame_wordpuzzle_survey.tkraise()
 
 def wp_submit_survey():
-    for v in wp_survey_vars:
-        if v.get()==0:
-            messagebox.showwarning("Incomplete","Answer all questions."); return
-    wp_results[-1]["survey"] = {f"Q{i+1}":v.get() for i,v in enumerate(wp_survey_vars)}
-    global wp_current_puzzle_index
-    wp_current_puzzle_index += 1
-    if wp_current_puzzle_index < len(puzzles):
-        wp_show_puzzle(wp_current_puzzle_index)
+    if not wp_engine.submit_survey(wp_survey.answers()):
+        messagebox.showwarning("Incomplete","Answer all questions."); return
+    if wp_engine.advance():
+        wp_show_puzzle()
     else:
         wp_save_and_exit()
 
 def wp_save_and_exit():
-    file="word_puzzle_data.csv"
-    hdr=["ParticipantID","Age","Gender","Puzzle_Emotion","Puzzle_HintsUsed","Puzzle_Time","Gave_Up","Puzzle_Guesses"]+[f"Q{i+1}" for i in range(8)]
-    mode='a' if os.path.exists(file) else 'w'
-    with open(file, mode, newline='') as f:
-        w = csv.writer(f)
-        if mode=='w': w.writerow(hdr)
-        for r in wp_results:
-            row = [
-                participant_info["ParticipantID"],participant_info["Age"],participant_info["Gender"],
-                r["emotion"],r["hints_used"],r["time"],r["gave_up"],";".join(r["guesses"])
-            ] + [r["survey"].get(f"Q{i+1}","") for i in range(8)]
-            w.writerow(row)
+    event_store.export(store, "word_puzzle")
+    finish_session(participant_info["ParticipantID"])
     messagebox.showinfo("Done","Thank you for participating!")
     root.destroy()
 
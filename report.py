@@ -0,0 +1,117 @@
+import argparse, contextlib, html, io, os, pickle, runpy, sys, time, traceback
+from concurrent.futures import ProcessPoolExecutor
+import matplotlib
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+# ------------------- Headless Report -------------------
+# Runs the analysis scripts unchanged, without a display. plt.show() is
+# swapped for a hook that pickles each finished figure and hands it to a
+# process pool, which draws it with Agg and writes a PNG; the script carries
+# on with its statistics meanwhile instead of blocking on a window. Printed
+# tables are captured too, and everything ends up in report/index.html.
+#
+#   python report.py                        both scripts, all cores
+#   python report.py stats_word_puzzle.py   one script
+#   python report.py -j 1 --out /tmp/rep    serial, elsewhere
+#
+# A script that fails part-way still reports the figures and output it
+# produced, with the traceback.
+
+SCRIPTS = ("stats_word_puzzle.py", "stats_farhan.py")
+REPORT_DIR = "report"
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def _render(blob, path, dpi):
+    fig = pickle.loads(blob)
+    fig.savefig(path, dpi=dpi, bbox_inches="tight")
+    plt.close(fig)
+    return path
+
+def _title(fig):
+    if fig._suptitle is not None and fig._suptitle.get_text():
+        return fig._suptitle.get_text()
+    return next((ax.get_title() for ax in fig.axes if ax.get_title()), "")
+
+
+class FigureSink:
+    """Stands in for plt.show(): queues every open figure for rendering, then closes it."""
+    def __init__(self, pool, out, prefix, dpi):
+        self.pool, self.out, self.prefix, self.dpi = pool, out, prefix, dpi
+        self.figures = []
+
+    def __call__(self, *args, **kwargs):
+        for num in plt.get_fignums():
+            fig  = plt.figure(num)
+            name = f"{self.prefix}-{len(self.figures) + 1:02d}.png"
+            job  = self.pool.submit(_render, pickle.dumps(fig), os.path.join(self.out, name), self.dpi)
+            self.figures.append((name, _title(fig), job))
+        plt.close("all")
+
+
+def run_script(script, pool, out, dpi=100):
+    """Run one analysis script with figures going to `pool`; returns its report section."""
+    prefix = os.path.splitext(os.path.basename(script))[0]
+    sink, text, error = FigureSink(pool, out, prefix, dpi), io.StringIO(), None
+    show, plt.show = plt.show, sink
+    t0 = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(text):
+            ns = runpy.run_path(os.path.join(HERE, script), run_name="__report__")
+            if callable(ns.get("main")):         # scripts with sections run them all
+                ns["main"]([])
+        sink()                                  # figures left open without a show()
+    except BaseException:
+        error = traceback.format_exc()
+    finally:
+        plt.show = show
+    return {"script": script, "text": text.getvalue(), "error": error,
+            "figures": sink.figures, "seconds": time.perf_counter() - t0}
+
+
+def write_index(sections, out, elapsed):
+    parts = ["<!doctype html><meta charset='utf-8'><title>Analysis report</title>"
+             "<style>body{font-family:sans-serif;margin:2em}figure{display:inline-block;margin:.5em;"
+             "width:420px;vertical-align:top}img{width:100%}pre{background:#f4f4f4;padding:1em;"
+             "overflow:auto}.err{color:#a00}</style>",
+             f"<h1>Analysis report</h1><p>{time.strftime('%Y-%m-%d %H:%M')} &middot; "
+             f"{sum(len(s['figures']) for s in sections)} figures in {elapsed:.1f}s</p>"]
+    for s in sections:
+        parts.append(f"<h2>{html.escape(s['script'])}</h2>")
+        if s["error"]:
+            parts.append(f"<pre class='err'>{html.escape(s['error'])}</pre>")
+        for name, title, _ in s["figures"]:
+            parts.append(f"<figure><img src='{name}' loading='lazy'>"
+                         f"<figcaption>{html.escape(title or name)}</figcaption></figure>")
+        parts.append(f"<details><summary>Printed output</summary><pre>{html.escape(s['text'])}</pre></details>")
+    path = os.path.join(out, "index.html")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(parts))
+    return path
+
+
+def build(scripts=SCRIPTS, out=REPORT_DIR, jobs=None, dpi=100):
+    os.makedirs(out, exist_ok=True)
+    t0 = time.perf_counter()
+    with ProcessPoolExecutor(jobs or os.cpu_count() or 1) as pool:
+        sections = [run_script(s, pool, out, dpi) for s in scripts]
+        for s in sections:
+            for _, _, job in s["figures"]:
+                job.result()
+    return write_index(sections, out, time.perf_counter() - t0), sections
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Render the analysis scripts' figures to a static HTML report.")
+    ap.add_argument("scripts", nargs="*", default=list(SCRIPTS))
+    ap.add_argument("-j", "--jobs", type=int, default=None, help="render processes (default: all cores)")
+    ap.add_argument("--out", default=REPORT_DIR)
+    ap.add_argument("--dpi", type=int, default=100)
+    args = ap.parse_args()
+    index, sections = build(args.scripts, args.out, args.jobs, args.dpi)
+    for s in sections:
+        status = "FAILED (see report)" if s["error"] else "ok"
+        print(f"{s['script']:<24} {len(s['figures']):>3} figures  {s['seconds']:6.2f}s  {status}")
+    print("report:", index)
+    sys.exit(1 if any(s["error"] for s in sections) else 0)
@@ -0,0 +1,155 @@
+import argparse, os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+import numpy as np
+
+# ------------------- Resampling Tests -------------------
+# Distribution-free check of the tone effects that stats_farhan.py tests with
+# ANOVA / Tukey. Solve times are small-sample and skewed, so alongside them:
+#
+#   permutation test  tone labels shuffled N times; p for the omnibus effect
+#                     (between-tone sum of squares) and every pair of tones
+#                     (difference of means), all from the same shuffles
+#   bootstrap         each tone resampled with replacement; percentile CIs
+#                     for every tone mean and pairwise difference
+#
+# Resamples run in batches as array operations (a batch of shuffles is one
+# 2-D permuted array, summed per tone with reduceat), optionally spread over
+# processes. Pairs are tested against the same shuffles of all tones. Every
+# batch draws from its own child of SeedSequence(seed), so results depend on
+# the seed only, not on the number of processes.
+#
+#   python resampling.py                   all DVs, 20000 resamples each
+#   python resampling.py -n 50000 -j 4 --seed 7
+
+# (phase, dv, iv) as analysed in stats_farhan.py
+TONE_EFFECTS = [
+    ("wordle",      "Attempts",        "AI_Tone"),
+    ("wordle",      "Total_Time_sec",  "AI_Tone"),
+    ("wordle",      "Hints_Count",     "AI_Tone"),
+    ("word_puzzle", "Hints_Used",      "Puzzle_Emotion"),
+    ("word_puzzle", "Puzzle_Time_sec", "Puzzle_Emotion"),
+]
+CELLS_PER_BATCH = 4_000_000     # resamples x observations held in memory at once
+
+
+def _batches(n, n_obs):
+    size = max(1, min(n, CELLS_PER_BATCH // max(n_obs, 1)))
+    return [min(size, n - i) for i in range(0, n, size)]
+
+def _pairs(k):
+    return [(i, j) for i in range(k) for j in range(i + 1, k)]
+
+
+def _perm_batch(ordered, starts, counts, observed, size, seed):
+    """Shuffle `size` times; count statistics at least as extreme as observed.
+
+    `ordered` holds the values sorted by tone, so after shuffling the values
+    each tone's sum is one contiguous reduceat segment.
+    """
+    rng, k = np.random.default_rng(seed), len(counts)
+    shuffled = rng.permuted(np.broadcast_to(ordered, (size, len(ordered))), axis=1)
+    means = np.add.reduceat(shuffled, starts, axis=1) / counts
+    grand = ordered.mean()
+    ss = ((means - grand) ** 2 * counts).sum(axis=1)
+    i, j = np.array(_pairs(k), dtype=int).reshape(-1, 2).T
+    diffs = np.abs(means[:, i] - means[:, j])
+    eps = 1e-12 * max(1.0, abs(grand))
+    return (ss >= observed[0] - eps).sum(), (diffs >= observed[1] - eps).sum(axis=0)
+
+def _boot_batch(groups, size, seed):
+    """Bootstrap means of every group, `size` resamples each: (size, k)."""
+    rng = np.random.default_rng(seed)
+    return np.column_stack([g[rng.integers(0, len(g), (size, len(g)))].mean(axis=1) for g in groups])
+
+
+def tone_effect(values, labels, n_perm=20000, n_boot=20000, seed=0, jobs=1, ci=0.95, pool=None):
+    """Permutation p-values and bootstrap CIs for the effect of `labels` on `values`.
+
+    Batches run on `pool` if given, else on a pool of `jobs` processes made for this call."""
+    values, labels = np.asarray(values, dtype=float), np.asarray(labels).astype(str)
+    keep = ~np.isnan(values)
+    values, labels = values[keep], labels[keep]
+    names, codes = np.unique(labels, return_inverse=True)
+    k = len(names)
+    if k < 2:
+        raise ValueError(f"need values for at least two groups, got {k}")
+    if n_perm < 1 or n_boot < 1:
+        raise ValueError("n_perm and n_boot must be at least 1")
+    counts = np.bincount(codes, minlength=k).astype(float)
+    means = np.bincount(codes, values, k) / counts
+    pairs = _pairs(k)
+    observed = (((means - values.mean()) ** 2 * counts).sum(),
+                np.array([abs(means[i] - means[j]) for i, j in pairs]))
+    groups = [values[codes == g] for g in range(k)]
+    ordered, starts = np.concatenate(groups), np.r_[0, np.cumsum(counts)[:-1]].astype(int)
+
+    perm_seeds, boot_seeds = np.random.SeedSequence(seed).spawn(2)
+    perm_sizes, boot_sizes = _batches(n_perm, len(values)), _batches(n_boot, len(values))
+    perm_jobs = [(ordered, starts, counts, observed, s, q)
+                 for s, q in zip(perm_sizes, perm_seeds.spawn(len(perm_sizes)))]
+    boot_jobs = [(groups, s, q) for s, q in zip(boot_sizes, boot_seeds.spawn(len(boot_sizes)))]
+    if (pool is not None or jobs > 1) and len(perm_jobs) + len(boot_jobs) > 1:
+        with nullcontext(pool) if pool is not None else ProcessPoolExecutor(jobs) as pool:
+            perm = list(pool.map(_perm_batch, *zip(*perm_jobs)))
+            boot = list(pool.map(_boot_batch, *zip(*boot_jobs)))
+    else:
+        perm = [_perm_batch(*a) for a in perm_jobs]
+        boot = [_boot_batch(*a) for a in boot_jobs]
+
+    ge_ss = sum(p[0] for p in perm)
+    ge_pairs = sum(p[1] for p in perm) if pairs else np.zeros(0)
+    boot = np.vstack(boot)
+    lo, hi = (1 - ci) / 2 * 100, (1 + ci) / 2 * 100
+    return {
+        "n_perm": n_perm, "n_boot": n_boot, "seed": seed, "ci": ci,
+        "p": (ge_ss + 1) / (n_perm + 1),
+        "groups": [{"name": names[g], "n": int(counts[g]), "mean": means[g],
+                    "ci": tuple(np.percentile(boot[:, g], [lo, hi]))} for g in range(k)],
+        "pairs": [{"pair": f"{names[i]} - {names[j]}", "diff": means[i] - means[j],
+                   "ci": tuple(np.percentile(boot[:, i] - boot[:, j], [lo, hi])),
+                   "p": (ge_pairs[x] + 1) / (n_perm + 1)} for x, (i, j) in enumerate(pairs)],
+    }
+
+
+def format_effect(dv, iv, r):
+    pct = f"{r['ci']:.0%} CI"
+    lines = [f"\n{dv} ~ {iv}: permutation p = {r['p']:.4f}  "
+             f"({r['n_perm']} permutations, {r['n_boot']} bootstrap resamples, seed {r['seed']})",
+             f"  {'tone':<22}{'n':>6}{'mean':>10}   {pct}"]
+    for g in r["groups"]:
+        lines.append(f"  {g['name']:<22}{g['n']:>6}{g['mean']:>10.2f}   [{g['ci'][0]:.2f}, {g['ci'][1]:.2f}]")
+    lines.append(f"  {'pair':<34}{'diff':>8}   {pct:<18}{'p':>8}")
+    for p in r["pairs"]:
+        ci_text = f"[{p['ci'][0]:.2f}, {p['ci'][1]:.2f}]"
+        lines.append(f"  {p['pair']:<34}{p['diff']:>8.2f}   {ci_text:<18}{p['p']:>8.4f}")
+    return "\n".join(lines)
+
+def tone_effects(frames, n_perm=20000, n_boot=20000, seed=0, jobs=1):
+    """Report for every TONE_EFFECTS entry; `frames` maps phase -> cleaned frame.
+
+    One process pool serves all the DVs."""
+    out = []
+    with ProcessPoolExecutor(jobs) if jobs > 1 else nullcontext() as pool:
+        for phase, dv, iv in TONE_EFFECTS:
+            df = frames[phase]
+            if dv in df.columns and iv in df.columns:
+                df = df[[dv, iv]].dropna()
+                if df[iv].nunique() < 2:
+                    out.append(f"\n{dv} ~ {iv}: skipped (fewer than two groups with data)")
+                    continue
+                r = tone_effect(df[dv], df[iv], n_perm, n_boot, seed, jobs, pool=pool)
+                out.append(format_effect(dv, iv, r))
+    return "\n".join(out)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Permutation and bootstrap tests of the tone effects.")
+    ap.add_argument("-n", "--resamples", type=int, default=20000, help="permutations and bootstrap resamples")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args()
+    from stats_prep import load
+    wdf, pdf = load()
+    print(tone_effects({"wordle": wdf, "word_puzzle": pdf}, args.resamples, args.resamples,
+                       args.seed, args.jobs))
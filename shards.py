@@ -0,0 +1,102 @@
+import csv, glob, os, re, socket, sys
+
+# ------------------- Station Shards -------------------
+# Several lab machines run sessions at once. Each station writes only to its
+# own directory, shards/<station>/, so no file ever has two writers and no
+# locking is needed. Every output row carries its Station.
+#
+#   python shards.py merge     combine all shards into ./wordle_data.csv etc.
+#
+# Merging makes two streaming passes over the shards and the existing
+# top-level file: the first finds, for every key, the copy with the latest
+# Started_At (when that puzzle attempt began), the second writes only those.
+# A participant re-run on another station, or re-run and appended to the same
+# file, keeps its latest attempt whatever the file dates; rows from before
+# Started_At existed lose to any stamped copy, later files winning among
+# unstamped ones. Only keys and their winning positions are held in memory.
+#
+# STATION_ID names this machine (default: host name); SHARD_DIR moves shards/.
+
+STATION   = re.sub(r"[^A-Za-z0-9_.-]", "_", os.getenv("STATION_ID") or socket.gethostname())
+SHARD_DIR = os.getenv("SHARD_DIR", "shards")
+
+
+def shard_path(name, station=STATION):
+    """This station's copy of output file `name`; the directory is created on demand."""
+    d = os.path.join(SHARD_DIR, station)
+    os.makedirs(d, exist_ok=True)
+    return os.path.join(d, name)
+
+
+# Output file -> key identifying one puzzle of one participant. `n` is the
+# row's ordinal among that participant's rows in the same file, for layouts
+# without a puzzle column.
+KEYS = {
+    "wordle_data.csv":      lambda r, n: (r.get("ParticipantID"), r.get("Target_Word")),
+    "word_puzzle_data.csv": lambda r, n: (r.get("ParticipantID"), n),
+    "experiment_data.csv":  lambda r, n: (r.get("ParticipantID"), r.get("Puzzle_Index")),
+}
+
+
+def _header(path):
+    with open(path, newline='') as f:
+        return next(csv.reader(f), [])
+
+def _stamp(r):
+    try:
+        return float(r.get("Started_At") or "-inf")
+    except ValueError:
+        return float("-inf")
+
+def _keyed_rows(inputs, key_of):
+    """(key, rank, row dict) for every row; a higher rank is a later attempt."""
+    for i, path in enumerate(inputs):
+        with open(path, newline='') as f:
+            reader = csv.reader(f)
+            cols = next(reader, [])
+            ordinal = {}
+            for j, row in enumerate(reader):
+                r = dict(zip(cols, row))
+                pid = r.get("ParticipantID")
+                ordinal[pid] = ordinal.get(pid, 0) + 1
+                yield key_of(r, ordinal[pid]), (_stamp(r), i, j), r
+
+def merge(name, out_dir=".", shard_dir=None):
+    """Merge every shards/*/<name> (plus an existing out_dir/<name>) into out_dir/<name>."""
+    shard_dir = shard_dir or SHARD_DIR
+    target = os.path.join(out_dir, name)
+    # oldest first, so on equal stamps the later file wins
+    inputs = ([target] if os.path.exists(target) else []) + \
+             sorted(glob.glob(os.path.join(shard_dir, "*", name)), key=os.path.getmtime)
+    if not inputs:
+        return None, 0, 0
+
+    # headers only grow trailing columns, so the longest one covers every input
+    header = max((_header(p) for p in inputs), key=len)
+    key_of = KEYS.get(name, lambda r, n: tuple(r.values()))
+    best = {}
+    for key, rank, _ in _keyed_rows(inputs, key_of):
+        if key not in best or rank > best[key]:
+            best[key] = rank
+    kept = dropped = 0
+    tmp = target + ".merge.tmp"
+    with open(tmp, "w", newline='') as out:
+        w = csv.writer(out)
+        w.writerow(header)
+        for key, rank, r in _keyed_rows(inputs, key_of):
+            if rank != best[key]:
+                dropped += 1
+                continue
+            w.writerow([r.get(c, "") for c in header])
+            kept += 1
+    os.replace(tmp, target)
+    return target, kept, dropped
+
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "merge"
+    if cmd == "merge":
+        for name in KEYS:
+            path, kept, dropped = merge(name)
+            if path:
+                print(f"{path}: {kept} rows ({dropped} duplicates dropped)")
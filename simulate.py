@@ -0,0 +1,181 @@
+import argparse, csv, os, random, tempfile, time
+from concurrent.futures import ProcessPoolExecutor
+from experiment_config import SURVEY_TEMPLATE
+from experiment_engine import (WordleEngine, WordPuzzleEngine, WORDLE_FILE, WORDLE_HEADER,
+                               WORD_PUZZLE_FILE, WORD_PUZZLE_HEADER)
+from shards import merge
+from speech_pipeline import split_sentences
+from word_dict import shared_dict
+
+# ------------------- Simulated Participants -------------------
+# Drives the headless engines with scripted participants against stub hint
+# and TTS backends, writes the real output CSVs to a scratch directory and
+# checks them back. Catches data-path regressions without a display, network
+# or audio device.
+#
+#   python simulate.py -n 20000             # 20000 participants over all cores, report throughput
+#                                           # (one station shard per process, merged into --out)
+#   python simulate.py -n 200 --matrix      # also narrow candidates with wordle_matrix
+#   python simulate.py -j 1 --out sim_data  # one process, keep the CSVs
+#   python simulate.py -n 200 --store       # also write every action to event_store
+
+
+class StubLLM:
+    """Same interface as HintClient.complete, answers instantly."""
+    def __init__(self):
+        self.calls = 0
+
+    def complete(self, messages, max_tokens, temperature, tone, kind="hint", answer="", on_delta=None):
+        self.calls += 1
+        text = (f"The answer was {answer}." if kind == "giveup"
+                else f"{tone} hint number {self.calls}. Think about it.")
+        if on_delta is not None:
+            on_delta(text)
+        return text, "stub"
+
+
+class StubTTS:
+    """Stands in for the sentence pipeline + Polly: counts what would be spoken."""
+    def __init__(self):
+        self.sentences = 0
+
+    def speak(self, text):
+        self.sentences += len(split_sentences(text))
+
+
+class Clock:
+    """Simulated time, advanced by the participant script."""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def wait(self, rng, lo, hi):
+        self.now += rng.uniform(lo, hi)
+
+
+LIKERT = range(1, 6)
+
+def run_participant(pid, rng, llm, tts, dictionary, matrix, out, store=None, station="sim"):
+    clock = Clock()
+    info = {"ParticipantID": str(pid), "Age": rng.choice(["18-24","25-34","35-44"]),
+            "Gender": rng.choice(["Male","Female","Prefer not to say"])}
+    survey = lambda: rng.choices(LIKERT, k=len(SURVEY_TEMPLATE))
+    message = lambda prompt: [{"role": "system", "content": prompt}]
+
+    w = WordleEngine(info, dictionary=dictionary, matrix=matrix, clock=clock, store=store,
+                     station=station)
+    while w.load_next():
+        skill = rng.uniform(0.1, 0.5)
+        while w.active:
+            clock.wait(rng, 2, 20)
+            guess = w.target if rng.random() < skill else dictionary[int(rng.random() * len(dictionary))]
+            res = w.submit_guess(guess)
+            if res.status == "wrong" and rng.random() < 0.5:
+                clock.wait(rng, 1, 5)
+                text, source = llm.complete(message(w.begin_hint()), 120, 0.7, w.tone)
+                w.record_hint(text, source)
+                tts.speak(text)
+            elif res.status == "failed":
+                text, _ = llm.complete(message(w.giveup_prompt()), 50, 0.5, w.tone, "giveup", w.target)
+                tts.speak(text)
+        w.finish()
+        assert not w.submit_survey([0] * len(SURVEY_TEMPLATE))
+        assert w.submit_survey(survey())
+    w.save(os.path.join(out, WORDLE_FILE))
+
+    wp = WordPuzzleEngine(info, clock=clock, store=store, station=station)
+    while True:
+        for _ in range(rng.randint(0, 4)):
+            clock.wait(rng, 3, 30)
+            if wp.submit_guess(rng.choice(["guess", "word", "thing"])) == "wrong":
+                text, source = llm.complete(message(wp.next_hint_prompt()), 120, 0.7, wp.emotion)
+                wp.record_hint(text, source)
+                tts.speak(text)
+        if rng.random() < 0.7:
+            wp.submit_guess(wp.answer)
+        else:
+            wp.give_up()
+            text, _ = llm.complete(message(wp.giveup_prompt()), 100, 0.5, wp.emotion, "giveup", wp.answer)
+            tts.speak(text)
+        assert wp.submit_survey(survey())
+        if not wp.advance():
+            break
+    wp.save(os.path.join(out, WORD_PUZZLE_FILE))
+    return len(w.records), len(wp.results)
+
+
+def check_csv(path, header, expected_rows):
+    with open(path, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == header, f"{path}: header changed"
+    bad = [i for i, r in enumerate(rows[1:], 2) if len(r) != len(header)]
+    assert not bad, f"{path}: ragged rows at lines {bad[:5]}"
+    assert len(rows) - 1 == expected_rows, f"{path}: {len(rows)-1} rows, expected {expected_rows}"
+
+
+def run_batch(pids, seed, out, use_matrix, use_store=False, station="sim"):
+    """Run participants `pids` into `out`; returns (wordle_rows, word_puzzle_rows, hint_calls, sentences)."""
+    os.makedirs(out, exist_ok=True)
+    for name in (WORDLE_FILE, WORD_PUZZLE_FILE, "experiment.sqlite"):
+        if os.path.exists(os.path.join(out, name)):
+            os.remove(os.path.join(out, name))
+    store = None
+    if use_store:
+        from event_store import EventStore
+        store = EventStore(os.path.join(out, "experiment.sqlite"))
+    matrix = None
+    if use_matrix:
+        from wordle_matrix import shared_matrix
+        matrix = shared_matrix()
+    rng, llm, tts, dictionary = random.Random(seed), StubLLM(), StubTTS(), shared_dict()
+    w_rows = wp_rows = 0
+    for pid in pids:
+        a, b = run_participant(pid, rng, llm, tts, dictionary, matrix, out, store, station)
+        w_rows, wp_rows = w_rows + a, wp_rows + b
+    if store is not None:
+        assert len(store.rows("wordle")) == w_rows and len(store.rows("word_puzzle")) == wp_rows
+        store.close()
+    check_csv(os.path.join(out, WORDLE_FILE), WORDLE_HEADER, w_rows)
+    check_csv(os.path.join(out, WORD_PUZZLE_FILE), WORD_PUZZLE_HEADER, wp_rows)
+    return w_rows, wp_rows, llm.calls, tts.sentences
+
+
+def simulate(n, seed=0, out=None, use_matrix=False, jobs=1, use_store=False):
+    """Run n participants, split over `jobs` processes acting as separate stations, then merge."""
+    out = out or tempfile.mkdtemp(prefix="sim_")
+    t0 = time.perf_counter()
+    if jobs <= 1:
+        totals = [run_batch(range(1, n + 1), seed, out, use_matrix, use_store)]
+    else:
+        with ProcessPoolExecutor(jobs) as pool:
+            futures = [pool.submit(run_batch, range(1 + k, n + 1, jobs), seed + k,
+                                   os.path.join(out, "shards", f"sim{k}"), use_matrix, use_store, f"sim{k}")
+                       for k in range(jobs)]
+            totals = [f.result() for f in futures]
+        for name, header, rows in ((WORDLE_FILE, WORDLE_HEADER, 0), (WORD_PUZZLE_FILE, WORD_PUZZLE_HEADER, 1)):
+            if os.path.exists(os.path.join(out, name)):
+                os.remove(os.path.join(out, name))
+            path, kept, dropped = merge(name, out, os.path.join(out, "shards"))
+            assert dropped == 0
+            check_csv(path, header, sum(t[rows] for t in totals))
+    elapsed = time.perf_counter() - t0
+    w_rows, wp_rows, calls, sentences = (sum(col) for col in zip(*totals))
+    return {"participants": n, "seconds": round(elapsed, 3),
+            "participants_per_sec": round(n / elapsed, 1), "hint_calls": calls,
+            "sentences": sentences, "wordle_rows": w_rows, "word_puzzle_rows": wp_rows,
+            "out": out}
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Run simulated participants through the experiment engine.")
+    ap.add_argument("-n", type=int, default=1000, help="number of participants")
+    ap.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--out", help="directory for the CSVs (default: a temp dir)")
+    ap.add_argument("--matrix", action="store_true", help="log remaining candidates via wordle_matrix")
+    ap.add_argument("--store", action="store_true", help="also log every action to an event store")
+    args = ap.parse_args()
+    for k, v in simulate(args.n, args.seed, args.out, args.matrix, args.jobs, args.store).items():
+        print(f"{k:>22}: {v}")
@@ -0,0 +1,100 @@
+import re, threading
+from concurrent.futures import ThreadPoolExecutor
+
+# ------------------- Sentence Pipeline -------------------
+# Sits between hint generation and the audio engine. As hint text streams in
+# it is cut into sentences; each complete sentence is synthesized at once
+# (several in parallel) and the clips are queued for playback strictly in
+# sentence order. Audio therefore starts after the first sentence instead of
+# after the whole generate -> synthesize -> decode chain.
+
+_END = re.compile(r'[.!?…]+["”’)\]]*\s+')
+
+_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="tts")
+
+
+def pop_sentences(buffer):
+    """Split complete sentences off the front of buffer; returns (sentences, remainder)."""
+    out, start = [], 0
+    for m in _END.finditer(buffer):
+        s = buffer[start:m.end()].strip()
+        if s:
+            out.append(s)
+        start = m.end()
+    return out, buffer[start:]
+
+def split_sentences(text):
+    out, rest = pop_sentences(text)
+    return out + ([rest.strip()] if rest.strip() else [])
+
+def _norm(text):
+    return " ".join(text.split())
+
+
+class SentencePipeline:
+    """Synthesize a streamed utterance sentence by sentence and play the clips in order.
+
+    synth(text) -> mp3 bytes runs on a worker thread; player is an AudioEngine.
+    A player.cancel() after the pipeline starts silences the rest of it.
+    """
+    def __init__(self, synth, player, priority=1):
+        self.synth      = synth
+        self.player     = player
+        self.priority   = priority
+        self.generation = player.generation
+        self.streamed   = ""
+        self.buffer     = ""
+        self.spoken     = []             # sentences already submitted
+        self.count      = 0
+        self.next_play  = 0
+        self.clips      = {}
+        self._lock      = threading.Lock()
+
+    def feed(self, delta):
+        self.streamed += delta
+        sentences, self.buffer = pop_sentences(self.buffer + delta)
+        for s in sentences:
+            self._submit(s)
+
+    def finish(self, final_text):
+        """Speak whatever of final_text has not been spoken yet.
+
+        Compared with whitespace normalized, so a final text that only differs
+        in spacing continues where the sentences left off. One that differs
+        otherwise (e.g. a fallback after a broken stream) has every sentence
+        not already spoken queued.
+        """
+        final, spoken = _norm(final_text), _norm(" ".join(self.spoken))
+        if final.startswith(spoken):
+            rest = split_sentences(final[len(spoken):])
+        else:
+            said = {_norm(x) for x in self.spoken}
+            rest = [x for x in split_sentences(final) if _norm(x) not in said]
+        for x in rest:
+            self._submit(x)
+        self.buffer = ""
+
+    def _submit(self, sentence):
+        self.spoken.append(sentence)
+        index, self.count = self.count, self.count + 1
+        future = _pool.submit(self._synth, sentence)
+        future.add_done_callback(lambda f: self._ready(index, f))
+
+    def _synth(self, sentence):
+        if self.player.generation != self.generation:
+            return None  # cancelled while queued; skip the Polly call
+        return self.synth(sentence)
+
+    def _ready(self, index, future):
+        try:
+            clip = future.result()
+        except Exception as e:
+            print("Polly error:", e)
+            clip = None
+        with self._lock:
+            self.clips[index] = clip
+            while self.next_play in self.clips:
+                clip = self.clips.pop(self.next_play)
+                self.next_play += 1
+                if clip is not None:
+                    self.player.play(clip, self.priority, self.generation)
@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+from tracing import tracer
+
+# ------------------- Background Startup -------------------
+# The experiment windows paint their consent screen first and build the slow
+# things behind it: importing openai / boto3, creating their clients and
+# opening the TLS connections the first hint and its speech will use. A
+# participant spends far longer on the notice than this takes, so by the first
+# hint the connections are already in the pool.
+#
+#   llm = Deferred("hint client", lambda: shared_client(api_key=KEY))
+#   llm.then(lambda c: c.warm())      # runs after the build, errors ignored
+#   llm.complete(...)                 # waits for the build if still running
+#
+# Attribute access is forwarded to the built object, so call sites use a
+# Deferred like the object itself. A build that raised re-raises on use.
+
+_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="startup")
+
+
+class Deferred:
+    """An object built on a background thread; attribute access waits for it."""
+    def __init__(self, name, build):
+        self.name = name
+        self._future = _pool.submit(self._build, build)
+
+    def _build(self, build):
+        with tracer.span("startup.load", what=self.name):
+            return build()
+
+    def get(self):
+        return self._future.result()
+
+    def ready(self):
+        return self._future.done()
+
+    def then(self, fn):
+        """Run fn(obj) on the pool once built; a failing warm-up only prints."""
+        def run(future):
+            if future.exception() is None:
+                _pool.submit(_quiet, self.name, fn, future.result())
+        self._future.add_done_callback(run)
+        return self
+
+    def __getattr__(self, attr):
+        return getattr(self.get(), attr)
+
+
+def _quiet(name, fn, obj):
+    try:
+        fn(obj)
+    except Exception as e:
+        print(f"Warm-up of {name} failed:", e)
+
+
+def first_paint(root):
+    """Draw the window now, before anything slow runs on the Tk thread."""
+    with tracer.span("startup.first_paint"):
+        root.update_idletasks()
+        root.update()
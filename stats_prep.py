@@ -0,0 +1,187 @@
+import hashlib, os, re, sys, time
+import numpy as np
+import pandas as pd
+
+# ------------------- Preprocessed Analysis Data -------------------
+# The cleaning every stats run used to repeat: find the CSVs, map the app's
+# column names to the ones the analysis uses, coerce numerics, impute survey
+# medians, count guesses, explode list columns to long format. The cleaned
+# frames and long tables are pickled to stats_cache/, named by a hash of the
+# input file and SCHEMA_VERSION, so an unchanged CSV loads straight from the
+# cache and any edit (or a change to the cleaning below, with a version bump)
+# rebuilds it.
+#
+#   python stats_prep.py          build / refresh the cache and report timings
+#   python stats_prep.py clear    delete the cache
+#
+# Bump SCHEMA_VERSION whenever the cleaning changes.
+
+SCHEMA_VERSION = 1
+CACHE_DIR = os.getenv("STATS_CACHE_DIR", "stats_cache")
+
+# phase -> candidate input files (first one that exists wins)
+INPUTS = {
+    "wordle":      ("wordle_data.csv", "Wordle_data.csv"),
+    "word_puzzle": ("word_puzzle_data.csv",),
+}
+
+# app / older column names -> analysis names
+RENAMES = {
+    "wordle": {"attempts": "Attempts", "time": "Total_Time_sec", "Total_Time": "Total_Time_sec",
+               "hints_count": "Hints_Count"},
+    "word_puzzle": {"Puzzle_HintsUsed": "Hints_Used", "Puzzle_Time": "Puzzle_Time_sec",
+                    "Puzzle_Time(sec)": "Puzzle_Time_sec"},
+}
+NUMERIC = {
+    "wordle":      ["Attempts", "Total_Time_sec", "Hints_Count"],
+    "word_puzzle": ["Hints_Used", "Puzzle_Time_sec"],
+}
+
+
+def input_path(phase):
+    for name in INPUTS[phase]:
+        if os.path.exists(name):
+            return name
+    raise FileNotFoundError(f"no {phase} data: expected one of {', '.join(INPUTS[phase])}")
+
+def file_hash(path):
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def survey_columns(df):
+    return [c for c in df.columns if c.startswith("Survey_Q")]
+
+def clean(df, phase):
+    """Rename, coerce and impute one raw frame (what stats_farhan did inline)."""
+    df = df.rename(columns=RENAMES[phase])
+    df = df.rename(columns={c: f"Survey_{c}" for c in df.columns if re.fullmatch(r"Q\d+", c)})
+    for c in NUMERIC[phase] + survey_columns(df):
+        df[c] = pd.to_numeric(df[c], errors="coerce")
+    for c in survey_columns(df):
+        m = df[c].median(skipna=True)
+        if not np.isnan(m):
+            df[c] = df[c].fillna(m)
+    if phase == "word_puzzle":
+        df["Num_Guesses"], df["Accurate_Ratio"] = guess_stats(df["Puzzle_Guesses"])
+    return df
+
+
+# ------------------- Long Format -------------------
+# The ";"-joined list columns exploded to one row per item with pandas string
+# ops: `row` is the source row's index, `n` the item's 1-based position, so
+# parallel lists (guesses / guess_times / remaining_candidates) line up on
+# (row, n). Blank cells contribute no rows; blank items inside a list are
+# kept (a guess with no candidate count) and read as NaN when numeric.
+
+def explode(col, sep=";"):
+    """(row, n, value) for every item of a sep-joined column."""
+    parts = col.dropna().astype(str).str.split(sep, regex=False).explode()
+    return pd.DataFrame({"row": parts.index, "n": parts.groupby(level=0).cumcount().to_numpy() + 1,
+                         "value": parts.to_numpy()})
+
+def _attach(long, col, name, numeric=True):
+    """Add the item of another list column at the same (row, n)."""
+    other = explode(col).rename(columns={"value": name})
+    if numeric:
+        other[name] = pd.to_numeric(other[name], errors="coerce")
+    return long.merge(other, on=["row", "n"], how="left")
+
+def _with_ids(long, df, ids):
+    ids = [c for c in ids if c in df.columns]
+    return long.join(df[ids], on="row")[["row"] + ids + [c for c in long.columns if c != "row"]]
+
+def guess_stats(guesses):
+    """Num_Guesses and Accurate_Ratio per row of a ";"-joined guesses column."""
+    long = explode(guesses)
+    accurate = long["value"].str.contains("Accurate", regex=False)
+    return (long.groupby("row").size().reindex(guesses.index, fill_value=0),
+            accurate.groupby(long["row"]).mean().reindex(guesses.index))
+
+def wordle_guesses(wdf):
+    """One row per Wordle guess: time since the puzzle started, candidates left, correct."""
+    long = explode(wdf["guesses"]).rename(columns={"value": "guess"})
+    long = _attach(long, wdf["guess_times"], "t_sec")
+    if "remaining_candidates" in wdf.columns:
+        long = _attach(long, wdf["remaining_candidates"], "remaining")
+    target = wdf["Target_Word"].astype(str).str.upper().reindex(long["row"]).to_numpy()
+    long["correct"] = long["guess"].str.upper().to_numpy() == target
+    return _with_ids(long.rename(columns={"n": "guess_no"}), wdf, ["ParticipantID", "AI_Tone", "Target_Word"])
+
+def wordle_hints(wdf):
+    """One row per Wordle hint: when it was requested and which path served it."""
+    long = explode(wdf["hint_times"]).rename(columns={"value": "t_sec"})
+    long["t_sec"] = pd.to_numeric(long["t_sec"], errors="coerce")
+    if "hint_sources" in wdf.columns:
+        long = _attach(long, wdf["hint_sources"], "source", numeric=False)
+    return _with_ids(long.rename(columns={"n": "hint_no"}), wdf, ["ParticipantID", "AI_Tone", "Target_Word"])
+
+def puzzle_guesses(pdf):
+    """One row per word-puzzle guess, flagged when it was marked Accurate."""
+    long = explode(pdf["Puzzle_Guesses"]).rename(columns={"n": "guess_no", "value": "guess"})
+    long["accurate"] = long["guess"].str.contains("Accurate", regex=False)
+    return _with_ids(long, pdf, ["ParticipantID", "Puzzle_Emotion"])
+
+# name -> (phase, builder over the cleaned frame)
+LONG_TABLES = {
+    "wordle_guesses": ("wordle", wordle_guesses),
+    "wordle_hints":   ("wordle", wordle_hints),
+    "puzzle_guesses": ("word_puzzle", puzzle_guesses),
+}
+
+
+def _cache_file(name, digest):
+    return os.path.join(CACHE_DIR, f"{name}-v{SCHEMA_VERSION}-{digest}.pkl")
+
+def _cached(name, path, build):
+    cached = _cache_file(name, file_hash(path))
+    if os.path.exists(cached):
+        return pd.read_pickle(cached)
+    df = build()
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    for old in os.listdir(CACHE_DIR):
+        if old.startswith(f"{name}-"):
+            os.remove(os.path.join(CACHE_DIR, old))
+    df.to_pickle(cached + ".tmp")
+    os.replace(cached + ".tmp", cached)
+    return df
+
+def prepared(phase, path=None):
+    """Cleaned frame for `phase`, from the cache when the input is unchanged."""
+    path = path or input_path(phase)
+    return _cached(phase, path, lambda: clean(pd.read_csv(path), phase))
+
+def long_table(name, path=None):
+    """One of LONG_TABLES, cached like the frame it is built from."""
+    phase, build = LONG_TABLES[name]
+    path = path or input_path(phase)
+    return _cached(name, path, lambda: build(prepared(phase, path)))
+
+def load():
+    """(wordle frame, word puzzle frame), cleaned."""
+    return prepared("wordle"), prepared("word_puzzle")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["clear"]:
+        n = 0
+        if os.path.isdir(CACHE_DIR):
+            for name in os.listdir(CACHE_DIR):
+                os.remove(os.path.join(CACHE_DIR, name)); n += 1
+        print(f"removed {n} cached frames")
+    else:
+        for phase in INPUTS:
+            path = input_path(phase)
+            hit = os.path.exists(_cache_file(phase, file_hash(path)))
+            t = time.perf_counter(); df = prepared(phase, path)
+            print(f"{phase:<15} {path:<22} {len(df):>7} rows  "
+                  f"{'cache hit' if hit else 'rebuilt':<9} {(time.perf_counter() - t) * 1000:7.1f} ms")
+        for name, (phase, _) in LONG_TABLES.items():
+            path = input_path(phase)
+            hit = os.path.exists(_cache_file(name, file_hash(path)))
+            t = time.perf_counter(); df = long_table(name, path)
+            print(f"{name:<15} {path:<22} {len(df):>7} rows  "
+                  f"{'cache hit' if hit else 'rebuilt':<9} {(time.perf_counter() - t) * 1000:7.1f} ms")
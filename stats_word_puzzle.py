@@ -1,6 +1,6 @@
 import pandas as pd
 import matplotlib.pyplot as plt
-import numpy as np
+from stats_prep import guess_stats
 
 # ------------------- Load Data -------------------
 csv_file = "word_puzzle_data.csv"  # Ensure this file is in the same directory
@@ -55,16 +55,9 @@ print(survey_summary)
 
 # ------------------- Puzzle Guesses Analysis -------------------
 # Here, we assume Puzzle_Guesses is a semicolon-separated string
-# Let's compute the average number of guesses per puzzle and proportion of accurate guesses.
-def parse_guesses(guess_str):
-    if pd.isna(guess_str):
-        return []
-    return guess_str.split(";")
-
-df["Num_Guesses"] = df["Puzzle_Guesses"].apply(lambda x: len(parse_guesses(x)))
-df["Accurate_Ratio"] = df["Puzzle_Guesses"].apply(
-    lambda x: np.mean([1 if "Accurate" in g else 0 for g in parse_guesses(x)]) if x and isinstance(x, str) else np.nan
-)
+# Let's compute the average number of guesses per puzzle and proportion of accurate guesses
+# (vectorized in stats_prep; stats_prep.long_table("puzzle_guesses") has one row per guess).
+df["Num_Guesses"], df["Accurate_Ratio"] = guess_stats(df["Puzzle_Guesses"])
 
 print("\nGuess Analysis:")
 print(df[["Puzzle_Guesses", "Num_Guesses", "Accurate_Ratio"]].head())
@@ -0,0 +1,132 @@
+import json, os, threading, time
+
+# ------------------- Latency Tracing -------------------
+# Spans around every slow step of a hint: the OpenAI request, Polly synthesis,
+# audio decode and playback, and the time a hint dialog is open. Spans are
+# written at session end as a Chrome trace (open in chrome://tracing or
+# https://ui.perfetto.dev), with a per-tone p50/p95 table printed and stored
+# in the trace's metadata.
+#
+# Tags set with tracer.tag(...) (tone, puzzle) are copied into every span
+# started afterwards; the session is one puzzle at a time, so a global tag
+# is exact. TRACE=0 turns tracing off; TRACE_DIR sets where traces go.
+# Nothing is written unless the app calls finish_session().
+
+
+class Span:
+    __slots__ = ("tracer", "name", "args", "start", "tid")
+
+    def __init__(self, tracer, name, args):
+        self.tracer, self.name, self.args = tracer, name, args
+        self.tid   = threading.get_ident()
+        self.start = time.perf_counter()
+
+    def end(self, **args):
+        if self.tracer is not None:
+            self.args.update(args)
+            self.tracer._record(self, time.perf_counter())
+            self.tracer = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.args["error"] = exc_type.__name__
+        self.end()
+
+
+class _NoSpan:
+    args = {}
+    def end(self, **args): pass
+    def __enter__(self): return self
+    def __exit__(self, *exc): pass
+
+
+class Tracer:
+    """Collects spans in memory; save() writes them as Chrome trace events."""
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.tags    = {}
+        self.events  = []
+        self.threads = {}
+        self.origin  = time.perf_counter()
+        self._lock   = threading.Lock()
+
+    def tag(self, **tags):
+        self.tags.update(tags)
+
+    def span(self, name, **args):
+        """Start a span; use as a context manager or call .end() (from any thread)."""
+        if not self.enabled:
+            return _NoSpan()
+        return Span(self, name, {**self.tags, **args})
+
+    def traced(self, name):
+        def wrap(fn):
+            def inner(*a, **kw):
+                with self.span(name):
+                    return fn(*a, **kw)
+            return inner
+        return wrap
+
+    def _record(self, span, stop):
+        event = {"name": span.name, "ph": "X", "pid": os.getpid(), "tid": span.tid,
+                 "ts": round((span.start - self.origin) * 1e6, 1),
+                 "dur": round((stop - span.start) * 1e6, 1), "args": span.args}
+        with self._lock:
+            self.events.append(event)
+            if span.tid not in self.threads:
+                self.threads[span.tid] = threading.current_thread().name
+
+    def summary(self, key="tone"):
+        """{(span name, tag value): {"n", "p50_ms", "p95_ms"}} over recorded spans."""
+        groups = {}
+        with self._lock:
+            for e in self.events:
+                groups.setdefault((e["name"], e["args"].get(key, "")), []).append(e["dur"] / 1000)
+        out = {}
+        for k, durs in sorted(groups.items()):
+            durs.sort()
+            pct = lambda q: round(durs[min(int(q * len(durs)), len(durs) - 1)], 1)
+            out[k] = {"n": len(durs), "p50_ms": pct(0.50), "p95_ms": pct(0.95)}
+        return out
+
+    def format_summary(self, key="tone"):
+        lines = [f"{'span':<22}{key:<14}{'n':>5}{'p50 ms':>10}{'p95 ms':>10}"]
+        for (name, value), s in self.summary(key).items():
+            lines.append(f"{name:<22}{str(value):<14}{s['n']:>5}{s['p50_ms']:>10}{s['p95_ms']:>10}")
+        return "\n".join(lines)
+
+    def save(self, path):
+        with self._lock:
+            events = list(self.events)
+            names  = [{"name": "thread_name", "ph": "M", "pid": os.getpid(), "tid": tid,
+                       "args": {"name": n}} for tid, n in self.threads.items()]
+        summary = {f"{n}|{v}": s for (n, v), s in self.summary().items()}
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w") as f:
+            json.dump({"traceEvents": names + events, "displayTimeUnit": "ms",
+                       "otherData": {"tags": self.tags, "summary_by_tone": summary}}, f)
+        return path
+
+
+tracer = Tracer(enabled=os.getenv("TRACE", "1") != "0")
+
+def session_path(participant=""):
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    name = f"session-{participant}-{stamp}.json" if participant else f"session-{stamp}.json"
+    return os.path.join(os.getenv("TRACE_DIR", "traces"), name)
+
+def finish_session(participant=""):
+    """Write this session's trace and print the per-tone latency table (once)."""
+    global _finished
+    if _finished or not tracer.enabled or not tracer.events:
+        return None
+    _finished = True
+    path = tracer.save(session_path(participant))
+    print(tracer.format_summary())
+    print("trace written to", path)
+    return path
+
+_finished = False
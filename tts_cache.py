@@ -0,0 +1,187 @@
+import hashlib, os, sys, threading
+from tracing import tracer
+
+# ------------------- TTS Audio Cache -------------------
+# Polly output keyed by hash of (voice, engine, SSML), stored one mp3 per key
+# on disk. Least-recently-played files are evicted once the directory exceeds
+# its size cap. Reads return plain bytes, so no file stays open or mapped and
+# eviction can remove any file (Windows refuses to delete a mapped one).
+#
+#   python tts_cache.py warm    pre-synthesize every static phrase for TONE_ORDER
+#   python tts_cache.py stats   entries / bytes on disk
+#
+# TTS_CACHE_DIR and TTS_CACHE_MAX_MB control location and cap.
+
+def ssml(text):
+    return f"<speak>{text}</speak>"
+
+
+class TTSCache:
+    """Content-addressed on-disk mp3 store with LRU eviction."""
+    def __init__(self, root="tts_cache", max_bytes=256 * 1024 * 1024):
+        self.root      = root
+        self.max_bytes = max_bytes
+        self._lock     = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self.sizes = {n: os.path.getsize(os.path.join(root, n))
+                      for n in os.listdir(root) if n.endswith(".mp3")}
+        self.total = sum(self.sizes.values())
+        self.hits = self.misses = 0
+
+    @staticmethod
+    def key(voice, engine, ssml_text):
+        digest = hashlib.sha256(f"{voice}\0{engine}\0{ssml_text}".encode("utf-8")).hexdigest()
+        return digest + ".mp3"
+
+    def get(self, voice, engine, ssml_text):
+        """mp3 bytes for this utterance, or None."""
+        path = os.path.join(self.root, self.key(voice, engine, ssml_text))
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+            os.utime(path)  # mtime doubles as the LRU clock
+        except OSError:
+            audio = None
+        if not audio:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return audio
+
+    def contains(self, voice, engine, ssml_text):
+        return self.key(voice, engine, ssml_text) in self.sizes
+
+    def put(self, voice, engine, ssml_text, audio):
+        name = self.key(voice, engine, ssml_text)
+        path = os.path.join(self.root, name)
+        tmp  = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(audio)
+            os.replace(tmp, path)
+        except OSError as e:  # disk full, file in use: play it uncached
+            print("TTS cache error:", e)
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self.total += len(audio) - self.sizes.get(name, 0)
+            self.sizes[name] = len(audio)
+            self._evict(keep=name)
+
+    def _evict(self, keep):
+        if self.total <= self.max_bytes:
+            return
+        def mtime(n):
+            try:
+                return os.path.getmtime(os.path.join(self.root, n))
+            except OSError:
+                return 0
+        for name in sorted(self.sizes, key=mtime):
+            if name == keep:
+                continue
+            try:
+                os.remove(os.path.join(self.root, name))
+            except FileNotFoundError:
+                pass
+            except OSError:   # still open elsewhere: try again on the next put
+                continue
+            self.total -= self.sizes.pop(name)
+            if self.total <= self.max_bytes:
+                break
+
+    def synthesize(self, polly_client, ssml_text, voice, engine="neural"):
+        """Cached Polly synthesize_speech: returns mp3 bytes."""
+        with tracer.span("polly.synthesize", chars=len(ssml_text)) as span:
+            audio = self.get(voice, engine, ssml_text)
+            span.args["cached"] = audio is not None
+            if audio is not None:
+                return audio
+            resp = polly_client.synthesize_speech(
+                Engine=engine,
+                TextType='ssml',
+                Text=ssml_text,
+                OutputFormat='mp3',
+                VoiceId=voice
+            )
+            audio = resp['AudioStream'].read()
+            self.put(voice, engine, ssml_text, audio)
+            return audio
+
+    def stats(self):
+        return {"entries": len(self.sizes), "bytes": self.total,
+                "hits": self.hits, "misses": self.misses}
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+def shared_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = TTSCache(os.getenv("TTS_CACHE_DIR", "tts_cache"),
+                              int(float(os.getenv("TTS_CACHE_MAX_MB", "256")) * 1024 * 1024))
+        return _cache
+
+
+# ------------------- Warm-up -------------------
+
+def static_phrases():
+    """Every text known before the session: canned hints and give-up remarks
+    for each tone in TONE_ORDER, plus any recorded hint-cache responses.
+    Returns (hints, remarks)."""
+    from experiment_config import WORD_LIST, TONE_ORDER, puzzles
+    from hint_client import FALLBACK_HINTS, FALLBACK_GIVEUP
+    import hint_cache
+
+    hints, remarks = [], []
+    for tone in dict.fromkeys(TONE_ORDER):
+        hints += FALLBACK_HINTS[tone]
+    for word, tone in zip(WORD_LIST, TONE_ORDER):
+        remarks.append(FALLBACK_GIVEUP[tone].format(answer=word))
+    for p in puzzles:
+        remarks.append(FALLBACK_GIVEUP[p["emotion"]].format(answer=p["answer"]))
+
+    path = os.getenv("HINT_CACHE_PATH", "hint_cache.sqlite")
+    if os.path.exists(path):
+        hints += hint_cache.HintCache(path).responses()
+    return hints, remarks
+
+def static_utterances():
+    """SSML documents in the units they are spoken in: hints go through the
+    sentence pipeline one sentence at a time, give-up remarks are spoken whole."""
+    from speech_pipeline import split_sentences
+    hints, remarks = static_phrases()
+    docs = [ssml(s) for h in hints for s in split_sentences(h)] + [ssml(r) for r in remarks]
+    return list(dict.fromkeys(docs))
+
+def warm_connection(polly_client, engine="neural"):
+    """One cheap Polly call so the TLS handshake and credential lookup are
+    done before the first hint needs speech. Failures are left to synthesize()."""
+    with tracer.span("polly.warm") as span:
+        try:
+            polly_client.describe_voices(Engine=engine, LanguageCode="en-US")
+        except Exception as e:
+            span.args["error"] = type(e).__name__
+
+def warm(polly_client, voice, engine="neural", cache=None):
+    cache = cache or shared_cache()
+    done = 0
+    for doc in static_utterances():
+        if not cache.contains(voice, engine, doc):
+            cache.synthesize(polly_client, doc, voice, engine)
+            done += 1
+    return done
+
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "stats"
+    if cmd == "warm":
+        import boto3
+        from experiment_config import POLLY_VOICE, POLLY_ENGINE
+        polly = boto3.client('polly', region_name='us-east-1')
+        print("synthesized", warm(polly, POLLY_VOICE, POLLY_ENGINE), "new phrases")
+    print(shared_cache().stats())
@@ -0,0 +1,110 @@
+import tkinter as tk
+from tracing import tracer
+
+# ------------------- Pooled Widgets -------------------
+# The survey grid and the hint dialog are built once per session and rebound
+# for each puzzle, instead of destroying and recreating ~50 Tcl widgets per
+# survey and a Toplevel per hint.
+#
+#   survey = SurveyPanel(frame, len(SURVEY_TEMPLATE), style, on_submit)
+#   survey.show("Survey: Neutral Tone", questions)   # retitle, clear answers
+#   survey.answers()                                 # [1..5 or 0 per item]
+#
+#   dialog = HintDialog(root, style, theme=EmotionManager.theme, on_close=player.cancel)
+#   ticket = dialog.open("Neutral")                  # themed, modal, "Thinking…"
+#   dialog.set_text(ticket, text)                    # ignored once that hint's dialog closed
+#   dialog.wait()                                    # until OK / window close
+#
+# `style` holds the colours and fonts: bg, fg, accent, title_font, text_font,
+# option_font, button_font.
+
+
+class SurveyPanel:
+    """Title, one question label and 1-5 radio row per item, and a submit button."""
+    def __init__(self, parent, n_items, style, on_submit, scale=range(1, 6)):
+        bg, fg = style["bg"], style["fg"]
+        self.title = tk.Label(parent, font=style["title_font"], bg=bg, fg=fg)
+        self.title.pack(pady=10)
+        self.questions, self.vars = [], []
+        for _ in range(n_items):
+            q = tk.Label(parent, font=style["text_font"], bg=bg, fg=fg)
+            q.pack(anchor="w", padx=20, pady=2)
+            v = tk.IntVar(parent, value=0)
+            row = tk.Frame(parent, bg=bg); row.pack(anchor="w", padx=40)
+            for val in scale:
+                tk.Radiobutton(row, text=str(val), variable=v, value=val, font=style["option_font"],
+                               bg=bg, fg=fg, selectcolor=style["accent"]).pack(side="left")
+            self.questions.append(q); self.vars.append(v)
+        tk.Button(parent, text="Submit Survey", font=style["button_font"], bg=style["accent"],
+                  fg="white", command=on_submit).pack(pady=20)
+
+    def show(self, title, questions):
+        """Rebind the texts for this puzzle and clear the previous answers."""
+        self.title.config(text=title)
+        for lbl, v, q in zip(self.questions, self.vars, questions):
+            lbl.config(text=q)
+            v.set(0)
+
+    def answers(self):
+        return [v.get() for v in self.vars]
+
+
+class HintDialog:
+    """The modal hint window, withdrawn between hints and re-themed per tone."""
+    MIN_WIDTH = 440
+
+    def __init__(self, root, style, theme, on_close=None):
+        self.root, self.theme, self.on_close = root, theme, on_close
+        self.ticket, self.showing = 0, False
+        self._closed = tk.BooleanVar(root, value=True)
+        self.dlg = tk.Toplevel(root)
+        self.dlg.withdraw()
+        self.dlg.transient(root)
+        self.label = tk.Label(self.dlg, font=style["text_font"], fg=style["fg"], wraplength=400)
+        self.label.pack(padx=20, pady=20)
+        # intercept both OK and the window "X"
+        tk.Button(self.dlg, text="OK", command=self.close, font=style["button_font"],
+                  bg=style["accent"], fg="white").pack(pady=(0, 20))
+        self.dlg.protocol("WM_DELETE_WINDOW", self.close)
+
+    def open(self, tone):
+        """Show the dialog for a new hint; returns the ticket its text updates must carry."""
+        with tracer.span("dialog.open", tone=tone):
+            self.ticket += 1
+            self.showing = True
+            self._closed.set(False)
+            self.dlg.title(f"{tone} Hint")
+            self.theme(self.dlg, tone); self.theme(self.label, tone)
+            self.label.config(text="Thinking…")
+            # position only, so the dialog can grow as the text streams in
+            dw = max(self.dlg.winfo_reqwidth(), self.MIN_WIDTH)
+            dh = self.dlg.winfo_reqheight()
+            x = self.root.winfo_x() + (self.root.winfo_width() - dw) // 2
+            y = self.root.winfo_y() + (self.root.winfo_height() - dh) // 2
+            self.dlg.geometry(f"+{x}+{y}")
+            self.dlg.deiconify()
+            self.dlg.wait_visibility()
+            self.dlg.grab_set()
+        return self.ticket
+
+    def is_open(self, ticket):
+        return self.showing and ticket == self.ticket
+
+    def set_text(self, ticket, text):
+        if self.is_open(ticket):
+            self.label.config(text=text)
+
+    def close(self):
+        if not self.showing:
+            return
+        if self.on_close is not None:
+            self.on_close()
+        self.showing = False
+        self.dlg.grab_release()
+        self.dlg.withdraw()
+        self._closed.set(True)
+
+    def wait(self):
+        """Block (running the event loop) until the current hint's dialog is closed."""
+        if self.showing:
+            self.root.wait_variable(self._closed)
@@ -0,0 +1,81 @@
+import mmap, os, sys, threading
+
+# ------------------- Compiled Word Dictionary -------------------
+# wordlist.txt compiled into sorted, packed 5-byte uppercase ASCII records
+# with no separators. Opening it is one mmap (no parsing, nothing read until
+# a lookup touches it); membership is a binary search over the records.
+#
+#   python word_dict.py build [wordlist.txt] [wordlist.dict]
+#
+# The compiled file is rebuilt automatically when it is missing or older
+# than the word list.
+
+WIDTH = 5
+
+
+def build(wordlist="wordlist.txt", path="wordlist.dict"):
+    with open(wordlist) as f:
+        words = sorted({w.strip().upper() for w in f if len(w.strip()) == WIDTH})
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write("".join(words).encode("ascii"))
+    os.replace(tmp, path)
+    return len(words)
+
+
+class WordDict:
+    """Read-only, memory-mapped view of a compiled dictionary."""
+    def __init__(self, path="wordlist.dict"):
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.count = len(self._map) // WIDTH
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, i):
+        return self._map[i * WIDTH:(i + 1) * WIDTH].decode("ascii")
+
+    def __contains__(self, word):
+        if len(word) != WIDTH:
+            return False
+        try:
+            key = word.upper().encode("ascii")
+        except UnicodeEncodeError:
+            return False
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            rec = self._map[mid * WIDTH:(mid + 1) * WIDTH]
+            if rec < key:
+                lo = mid + 1
+            elif rec > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def __iter__(self):
+        return (self[i] for i in range(self.count))
+
+
+_dict = None
+_dict_lock = threading.Lock()
+
+def shared_dict(wordlist="wordlist.txt", path="wordlist.dict"):
+    """The process-wide WordDict, compiled from `wordlist` first if stale."""
+    global _dict
+    with _dict_lock:
+        if _dict is None:
+            if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(wordlist):
+                build(wordlist, path)
+            _dict = WordDict(path)
+        return _dict
+
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "build"
+    if cmd == "build":
+        src = sys.argv[2] if len(sys.argv) > 2 else "wordlist.txt"
+        out = sys.argv[3] if len(sys.argv) > 3 else "wordlist.dict"
+        print("compiled", build(src, out), "words into", out)
@@ -1,17 +1,20 @@
 import tkinter as tk
 from tkinter import messagebox
 import time
-import csv
 import random
-import openai
 import os
+from hint_worker import HintWorker, set_thinking
+from startup import Deferred, first_paint
+from hint_client import fallback, shared_client
+import csv_store
+from word_dict import shared_dict
+from shards import STATION, shard_path
 
-# Load wordlist for guess validation
-with open("wordlist.txt") as f:
-    VALID_WORDS = set(word.strip().upper() for word in f if len(word.strip()) == 5)
+# Compiled wordlist for guess validation (mmapped; rebuilt if wordlist.txt changed)
+VALID_WORDS = shared_dict()
 
 # Replace this with your secure OpenAI key handling
-openai.api_key = os.getenv("OPENAI_API_KEY")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
 # Puzzle set (shared across all participants)
 PUZZLES = [
@@ -45,53 +48,93 @@ TONE_HINT_PROMPTS = {
 # Assign tones randomly per participant
 random.shuffle(TONES)
 
-# Participant metadata
-participant_id = input("Participant ID: ")
-age = input("Age: ")
-gender = input("Gender: ")
+# Participant metadata (filled in on the consent screen)
+participant_id = age = gender = ""
 
-# CSV file setup
-CSV_FILE = "experiment_data.csv"
+# CSV file setup: this station's shard only (python shards.py merge combines them)
+CSV_FILE = shard_path("experiment_data.csv")
 header = [
-    "ParticipantID", "Age", "Gender", "Puzzle_Index", "Tone", "Answer", "Hints_Used", "Solved", "Time(sec)", "Hint_Texts"
+    "ParticipantID", "Age", "Gender", "Puzzle_Index", "Tone", "Answer", "Hints_Used", "Solved", "Time(sec)", "Hint_Texts",
+    "Hint_Sources", "Station", "Started_At"
 ]
 
-if not os.path.exists(CSV_FILE):
-    with open(CSV_FILE, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(header)
-
 # Tkinter UI setup
 root = tk.Tk()
 root.title("Word Puzzle Experiment")
 root.geometry("600x400")
 
-label_info = tk.Label(root, text="", font=("Arial", 14))
+# Consent screen: shown first, while the hint client loads in the background
+frame_consent = tk.Frame(root)
+frame_consent.pack(fill="both", expand=True)
+tk.Label(frame_consent, text="Word Puzzle Experiment", font=("Arial", 16, "bold")).pack(pady=10)
+tk.Label(frame_consent, font=("Arial", 11), wraplength=520, justify="left", text=(
+    "You will solve three word puzzles with help from an AI assistant. Your guesses, hints and "
+    "solve times are recorded under your participant ID only. You may stop at any time.")).pack(pady=5)
+entries = {}
+for name in ("Participant ID", "Age", "Gender"):
+    tk.Label(frame_consent, text=name + ":", font=("Arial", 12)).pack()
+    entries[name] = tk.Entry(frame_consent, font=("Arial", 12))
+    entries[name].pack(pady=2)
+
+# Puzzle screen
+frame_puzzle = tk.Frame(root)
+
+label_info = tk.Label(frame_puzzle, text="", font=("Arial", 14))
 label_info.pack(pady=10)
 
-label_clue = tk.Label(root, text="", font=("Arial", 12))
+label_clue = tk.Label(frame_puzzle, text="", font=("Arial", 12))
 label_clue.pack(pady=5)
 
-entry_guess = tk.Entry(root, font=("Arial", 14))
+entry_guess = tk.Entry(frame_puzzle, font=("Arial", 14))
 entry_guess.pack(pady=5)
 
-text_hint = tk.Text(root, height=6, width=70, state="disabled")
+text_hint = tk.Text(frame_puzzle, height=6, width=70, state="disabled")
 text_hint.pack(pady=5)
 
-btn_submit = tk.Button(root, text="Submit Guess")
+btn_submit = tk.Button(frame_puzzle, text="Submit Guess")
 btn_submit.pack(pady=5)
 
+hint_worker = HintWorker(root)
+
 # Experiment control variables
 current_index = 0
 start_time = 0
 hint_count = 0
 hint_log = []
+hint_sources = []
 current_answer = ""
 current_tone = ""
 
+def start_experiment():
+    """Takes the participant's details from the consent screen and opens the first puzzle."""
+    global participant_id, age, gender
+
+    participant_id, age, gender = (entries[n].get().strip() for n in ("Participant ID", "Age", "Gender"))
+    if not (participant_id and age and gender):
+        messagebox.showwarning("Missing Info", "Please fill in all fields.")
+        return
+    frame_consent.pack_forget()
+    frame_puzzle.pack(fill="both", expand=True)
+    show_puzzle()
+    entry_guess.focus_set()
+
+tk.Button(frame_consent, text="Start", font=("Arial", 12), command=start_experiment).pack(pady=10)
+entries["Participant ID"].focus_set()
+
+# Paint the consent screen, then import openai, create the hint client and
+# open its connection in the background while the notice is being read.
+first_paint(root)
+def _hint_client():
+    return shared_client(api_key=OPENAI_API_KEY)
+
+llm = Deferred("hint client", _hint_client).then(lambda c: c.warm())
+
 def show_puzzle():
     """Initializes the next puzzle by updating UI with new clue and resetting state variables."""
-    global current_index, start_time, hint_count, hint_log, current_answer, current_tone
+    global current_index, start_time, hint_count, hint_log, hint_sources, current_answer, current_tone
+
+    hint_worker.cancel_stale()
+    set_thinking(btn_submit, False, "Submit Guess")
 
     if current_index >= len(PUZZLES):
         messagebox.showinfo("Done", "Experiment complete. Thank you!")
@@ -103,6 +146,7 @@ def show_puzzle():
     current_tone = TONES[current_index % len(TONES)]
     hint_count = 0
     hint_log = []
+    hint_sources = []
     start_time = time.time()
 
     label_info.config(text=f"Puzzle {current_index + 1} | Tone: {current_tone}")
@@ -133,29 +177,41 @@ def check_guess():
     else:
         hint_count += 1
         system_prompt = TONE_HINT_PROMPTS[current_tone].format(answer=current_answer)
-        try:
-            response = openai.ChatCompletion.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": f"The user guessed: {guess}"}
-                ],
-                max_tokens=60,
-                temperature=0.8
-            )
-            hint = response['choices'][0]['message']['content'].strip()
-        except Exception:
-            hint = "[Hint unavailable due to error.]"
-
-        hint_log.append(hint)
-        if hint_count >= 6:
-            save_result(solved=False)
-            current_index += 1
-            show_puzzle()
-        else:
-            text_hint.config(state="normal")
-            text_hint.insert(tk.END, f"Hint {hint_count}: {hint}\n")
-            text_hint.config(state="disabled")
+        set_thinking(btn_submit, True, "Submit Guess")
+        hint_worker.submit(
+            request_hint, system_prompt, guess, current_tone,
+            on_done=show_hint,
+            on_error=lambda e: show_hint((fallback(current_tone), "fallback"))
+        )
+
+def request_hint(system_prompt, guess, tone):
+    """Blocking hint request returning (hint, source); runs on hint_worker so the window stays responsive."""
+    return llm.complete(
+        [
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": f"The user guessed: {guess}"}
+        ],
+        max_tokens=60,
+        temperature=0.8,
+        tone=tone
+    )
+
+def show_hint(result):
+    """Records a finished hint and either shows it or ends the puzzle after the sixth miss."""
+    global current_index
+
+    hint, source = result
+    set_thinking(btn_submit, False, "Submit Guess")
+    hint_log.append(hint)
+    hint_sources.append(source)
+    if hint_count >= 6:
+        save_result(solved=False)
+        current_index += 1
+        show_puzzle()
+    else:
+        text_hint.config(state="normal")
+        text_hint.insert(tk.END, f"Hint {hint_count}: {hint}\n")
+        text_hint.config(state="disabled")
 
 def save_result(solved):
     """Saves participant performance data to CSV for the current puzzle.
@@ -166,12 +222,10 @@ def save_result(solved):
     elapsed = round(time.time() - start_time, 2)
     row = [
         participant_id, age, gender, current_index + 1, current_tone, current_answer,
-        hint_count, solved, elapsed, " | ".join(hint_log)
+        hint_count, solved, elapsed, " | ".join(hint_log), ";".join(hint_sources), STATION,
+        round(start_time, 3)
     ]
-    with open(CSV_FILE, 'a', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(row)
+    csv_store.append_rows(CSV_FILE, header, [row])
 
-# Start the experiment
-show_puzzle()
+# Start the experiment (the consent screen's Start button opens the first puzzle)
 root.mainloop()
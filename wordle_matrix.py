@@ -0,0 +1,128 @@
+import os, sys, threading
+import numpy as np
+
+# ------------------- Wordle Feedback Matrix -------------------
+# Every (guess, answer) pair over wordlist.txt scored once and stored as a
+# uint8 pattern code: base-3 digits per position, 0 gray / 1 gold / 2 green,
+# so 242 is all green. At runtime the .npy is memory-mapped, and narrowing
+# the candidate set after a guess is one row compare.
+#
+#   python wordle_matrix.py build [wordlist.txt]   writes wordle_matrix.npy + wordle_words.npy
+#
+# WORDLE_MATRIX_DIR controls where the two files live (default: current dir).
+
+GREEN, GOLD, GRAY = 2, 1, 0
+ALL_GREEN = 242
+_POW = np.array([1, 3, 9, 27, 81], dtype=np.uint8)
+
+
+def feedback(guess, answer):
+    """Per-letter colours for one guess, duplicates handled like Wordle."""
+    target = list(answer)
+    fb = ["gray"] * len(guess)
+    # mark greens
+    for i in range(len(guess)):
+        if guess[i] == target[i]:
+            fb[i], target[i] = "green", None
+    # mark golds
+    for i in range(len(guess)):
+        if fb[i] == "gray" and guess[i] in target:
+            fb[i], target[target.index(guess[i])] = "gold", None
+    return fb
+
+def pattern(guess, answer):
+    code = {"gray": GRAY, "gold": GOLD, "green": GREEN}
+    return sum(code[c] * 3 ** i for i, c in enumerate(feedback(guess, answer)))
+
+
+def _letters(words):
+    return np.frombuffer(b"".join(w.encode("ascii") for w in words), dtype=np.uint8).reshape(-1, 5)
+
+def score_rows(guesses, answers):
+    """Vectorised pattern codes, shape (len(guesses), len(answers)); both are (n, 5) uint8 letter arrays."""
+    g = guesses[:, None, :]                       # (G, 1, 5)
+    a = answers[None, :, :]                       # (1, A, 5)
+    green = g == a                                # (G, A, 5)
+    # letters of each guess position still unmatched in the answer
+    free = (g[..., :, None] == a[..., None, :]) & ~green[..., None, :]
+    avail = free.sum(axis=-1, dtype=np.uint8)     # (G, A, 5)
+    out = (green * np.uint8(GREEN) * _POW).sum(axis=-1, dtype=np.uint8)
+    for i in range(5):
+        # earlier non-green copies of this letter claim the free slots first
+        used = np.zeros(green.shape[:2], dtype=np.uint8)
+        for j in range(i):
+            same = guesses[:, j] == guesses[:, i]
+            used += (same[:, None] & ~green[..., j]).astype(np.uint8)
+        gold = ~green[..., i] & (avail[..., i] > used)
+        out += gold.astype(np.uint8) * _POW[i]
+    return out
+
+
+def build(wordlist="wordlist.txt", directory=".", chunk=64):
+    with open(wordlist) as f:
+        words = sorted({w.strip().upper() for w in f if len(w.strip()) == 5})
+    letters = _letters(words)
+    n = len(words)
+    path = os.path.join(directory, "wordle_matrix.npy")
+    tmp = path + ".tmp"
+    matrix = np.lib.format.open_memmap(tmp, mode="w+", dtype=np.uint8, shape=(n, n))
+    for start in range(0, n, chunk):
+        matrix[start:start + chunk] = score_rows(letters[start:start + chunk], letters)
+    matrix.flush()
+    del matrix
+    os.replace(tmp, path)
+    np.save(os.path.join(directory, "wordle_words.npy"), np.array(words, dtype="S5"))
+    return n
+
+
+class FeedbackMatrix:
+    """Memory-mapped guess x answer pattern matrix with candidate-set narrowing."""
+    def __init__(self, directory="."):
+        self.words   = np.load(os.path.join(directory, "wordle_words.npy"))
+        self.matrix  = np.load(os.path.join(directory, "wordle_matrix.npy"), mmap_mode="r")
+        self.index   = {w.decode("ascii"): i for i, w in enumerate(self.words)}
+        self.letters = self.words.view(np.uint8).reshape(-1, 5)
+
+    def row(self, guess):
+        """Patterns of `guess` against every answer; scored on the fly for off-list guesses."""
+        i = self.index.get(guess)
+        if i is not None:
+            return self.matrix[i]
+        return score_rows(_letters([guess]), self.letters)[0]
+
+    def all_candidates(self):
+        return np.ones(len(self.words), dtype=bool)
+
+    def narrow(self, candidates, guess, answer):
+        """Candidates still consistent after `guess` is scored against `answer`."""
+        return candidates & (self.row(guess) == pattern(guess, answer))
+
+    def remaining(self, guesses, answer):
+        """Number of words consistent with the feedback for all `guesses`."""
+        candidates = self.all_candidates()
+        for g in guesses:
+            candidates = self.narrow(candidates, g, answer)
+        return int(candidates.sum())
+
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+def shared_matrix():
+    """The process-wide FeedbackMatrix, or None if it hasn't been built."""
+    global _matrix
+    with _matrix_lock:
+        if _matrix is None:
+            try:
+                _matrix = FeedbackMatrix(os.getenv("WORDLE_MATRIX_DIR", "."))
+            except FileNotFoundError:
+                print("Wordle matrix not built; run `python wordle_matrix.py build`.")
+                _matrix = False
+        return _matrix or None
+
+
+if __name__ == "__main__":
+    cmd = sys.argv[1] if len(sys.argv) > 1 else "build"
+    if cmd == "build":
+        wordlist = sys.argv[2] if len(sys.argv) > 2 else "wordlist.txt"
+        print("scored", build(wordlist, os.getenv("WORDLE_MATRIX_DIR", ".")), "words")